@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Замер скорости ErrorClassifier на реальном error.log.
+Сравнивает построчное декодирование (bytes_mode=False) с байтовым
+префильтром (bytes_mode=True) и проверяет, что результаты совпадают.
+"""
+
+import os
+import sys
+import time
+
+from error_classifier import ErrorClassifier, ErrorStore
+from log_archive import open_log_stream
+from text_encoding import detect_file_encoding
+
+
+def run(classifier: ErrorClassifier, path: str, encoding: str, bytes_mode: bool, workers: int):
+    """Один проход; возвращает (время, хранилище)"""
+    classifier.cache_clear()
+    store = ErrorStore()
+    started = time.perf_counter()
+    for _ in classifier.iter_classify(
+            path, encoding=encoding, store=store, bytes_mode=bytes_mode, workers=workers):
+        pass
+    return time.perf_counter() - started, store
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Использование: python benchmark_classifier.py error.log [повторов] [процессов]")
+        sys.exit(0)
+
+    path = sys.argv[1]
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    size_mb = os.path.getsize(path) / (1 << 20)
+    with open_log_stream(path) as f:
+        encoding = detect_file_encoding(f, limit=1 << 20)
+
+    classifier = ErrorClassifier(verbose=False)
+    prefilter = classifier.bytes_prefilter(encoding)
+    print(f"📄 {path}: {size_mb:.1f} МБ, кодировка {encoding}")
+    if prefilter is None:
+        print("⚠️ Байтовый префильтр недоступен (правила без якоря или кодировка не ASCII‑совместима)")
+    else:
+        print(f"🔎 Триггеры префильтра ({len(prefilter.triggers)}): "
+              + ", ".join(t.decode(encoding) for t in prefilter.triggers))
+
+    results = {}
+    for label, bytes_mode in (("str", False), ("bytes", True)):
+        best, store = min(
+            (run(classifier, path, encoding, bytes_mode, workers) for _ in range(repeat)),
+            key=lambda r: r[0],
+        )
+        results[label] = store
+        print(f"  {label:<6} {best:7.3f} с  {size_mb / best:8.1f} МБ/с  "
+              f"(уникальных ошибок: {len(store)}, вхождений: {store.total_occurrences()})")
+
+    same = results["str"].to_state() == results["bytes"].to_state()
+    print("✅ Результаты совпадают" if same else "❌ Результаты различаются!")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
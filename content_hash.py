@@ -0,0 +1,158 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterable, List, Union
+
+
+# ─────────────────────────────────────────────
+# 🔐 Хэши содержимого файлов модов
+# ─────────────────────────────────────────────
+# Меняется вместе с форматом файла кэша (или алгоритмом хэша)
+CACHE_VERSION = 1
+# Потоков хэширования: hashlib отпускает GIL на больших блоках
+HASH_WORKERS = 8
+# Размер блока чтения
+HASH_CHUNK = 1 << 20
+# Длина blake2b в байтах: для сравнения копий одного файла хватает с запасом
+DIGEST_SIZE = 16
+
+
+def hash_file(path: Union[str, os.PathLike]) -> Optional[str]:
+    """blake2b содержимого файла (None — файл не прочитать)"""
+    h = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(HASH_CHUNK)
+                if not chunk:
+                    break
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class HashCache:
+    """
+    Хэши содержимого между запусками — в JSON, по ключу
+    (абсолютный путь, размер, mtime).
+
+        hashes = HashCache("cache/content_hashes.json")
+        classes = hashes.split_copies(groups)  # [0, 0, 1] — классы одинаковых копий
+        hashes.hits, hashes.misses, hashes.skipped
+        hashes.save()
+
+    Хэшируются только файлы, у которых есть копия того же размера, —
+    остальные заведомо отличаются. Нехэшированные в кэше читаются в пуле
+    потоков.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self._dirty = False
+        # абсолютный путь → [размер, mtime_ns, хэш]
+        self._entries: Dict[str, list] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    # ─────────────────────────────────────────
+    def reset_stats(self):
+        self.hits = self.misses = self.skipped = 0
+
+    def hash_many(
+        self, stamped: Dict[str, List[int]], workers: int = HASH_WORKERS
+    ) -> Dict[str, Optional[str]]:
+        """Хэши файлов {путь: [размер, mtime_ns]} — из кэша или в пуле потоков"""
+        result: Dict[str, Optional[str]] = {}
+        todo = []
+        for p, stamp in stamped.items():
+            key = os.path.abspath(p)
+            known = self._entries.get(key)
+            if known and known[:2] == stamp:
+                result[p] = known[2]
+                self.hits += 1
+            else:
+                todo.append((p, key, stamp))
+        if todo:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+                digests = list(pool.map(hash_file, [p for p, _, _ in todo]))
+            for (p, key, stamp), digest in zip(todo, digests):
+                result[p] = digest
+                if digest is not None:
+                    self._entries[key] = stamp + [digest]
+            self.misses += len(todo)
+            self._dirty = True
+        return result
+
+    def split_copies(
+        self, groups: Iterable[List[str]], workers: int = HASH_WORKERS
+    ) -> List[List[int]]:
+        """
+        Для каждой группы путей (копии одного относительного пути в разных
+        модах) — номера классов одинакового содержимого, по порядку путей:
+        [0, 0, 1] — первые два файла побайтно равны, третий отличается.
+
+        Сначала сравниваются размеры (stat, а не снимок индекса: правка
+        файла не меняет mtime каталога), хэшируются только совпавшие
+        по размеру — все группы разом, одним пулом.
+        """
+        groups = [list(g) for g in groups]
+        stamped: Dict[str, List[int]] = {}
+        sizes: List[List[int]] = []
+        for paths in groups:
+            row = []
+            for p in paths:
+                try:
+                    st = os.stat(p)
+                    stamp = [st.st_size, st.st_mtime_ns]
+                except OSError:
+                    stamp = [-1, -1]
+                row.append(stamp[0])
+                stamped[p] = stamp
+            sizes.append(row)
+
+        need: Dict[str, List[int]] = {}
+        for paths, row in zip(groups, sizes):
+            for p, size in zip(paths, row):
+                if size >= 0 and row.count(size) > 1:
+                    need[p] = stamped[p]
+                else:
+                    self.skipped += 1
+        digests = self.hash_many(need, workers)
+
+        classes: List[List[int]] = []
+        for paths, row in zip(groups, sizes):
+            seen: Dict[object, int] = {}
+            labels = []
+            for i, (p, size) in enumerate(zip(paths, row)):
+                digest = digests.get(p)
+                # без хэша файл равен только самому себе
+                ident = (size, digest) if digest is not None else ("unique", i)
+                labels.append(seen.setdefault(ident, len(seen)))
+            classes.append(labels)
+        return classes
+
+    def save(self):
+        """Записывает кэш (если что‑то хэшировалось), выбрасывая удалённые файлы"""
+        if not self._dirty:
+            return
+        entries = {k: v for k, v in self._entries.items() if os.path.exists(k)}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._entries = entries
+            self._dirty = False
+        except OSError as e:
+            print(f"[HashCache] Не удалось сохранить кэш: {e}")
@@ -0,0 +1,134 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, NamedTuple, Union
+
+from text_encoding import READ_CHUNK_SIZE, EncodingDetector
+
+
+# ─────────────────────────────────────────────
+# 🔤 Проверка BOM и UTF‑8 файлов модов
+# ─────────────────────────────────────────────
+# Меняется вместе с форматом файла кэша
+CACHE_VERSION = 1
+# Потоков проверки: файлы читаются параллельно, упираясь в задержки диска
+CHECK_WORKERS = 8
+# Так помечается файл, который не является UTF‑8
+NOT_UTF8 = "not utf-8"
+
+
+class FileCheck(NamedTuple):
+    """ok — UTF‑8 с BOM (как требует игра для локализации)"""
+    ok: bool
+    encoding: str
+    has_bom: bool
+
+
+def check_file(path: Union[str, os.PathLike]) -> FileCheck:
+    """
+    BOM и строгий UTF‑8 файла — потоково, блоками READ_CHUNK_SIZE, без chardet:
+    игре важно только «UTF‑8 с BOM или нет». Чтение прекращается на первой
+    ошибке декодирования; BOM UTF‑16/32 отвечает сразу.
+    """
+    det = EncodingDetector(sample_size=0)
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                det.feed(chunk, final=not chunk)
+                if not chunk or det.done:
+                    break
+    except OSError:
+        return FileCheck(False, "unknown", False)
+    has_bom = det.bom == "utf-8-sig"
+    if det.utf8_ok:
+        return FileCheck(has_bom, det.bom or "utf-8", has_bom)
+    return FileCheck(False, det.bom if det.bom and not has_bom else NOT_UTF8, has_bom)
+
+
+class EncodingCheckCache:
+    """
+    Результаты check_file между запусками — в JSON, по ключу
+    (абсолютный путь, размер, mtime).
+
+        checks = EncodingCheckCache("cache/encoding_checks.json")
+        results = checks.check_many(paths)     # путь → FileCheck
+        checks.hits, checks.misses             # из кэша / прочитано
+        checks.save()
+
+    Неизменившийся файл стоит один stat; изменившиеся и новые читаются
+    в пуле потоков.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        # абсолютный путь → [размер, mtime_ns, ok, кодировка, has_bom]
+        self._entries: Dict[str, list] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    # ─────────────────────────────────────────
+    def check_many(
+        self, paths: Iterable[Union[str, os.PathLike]], workers: int = CHECK_WORKERS
+    ) -> Dict[str, FileCheck]:
+        """Путь (как передан, строкой) → FileCheck для всех paths"""
+        results: Dict[str, FileCheck] = {}
+        todo = []
+        for p in paths:
+            p = os.fspath(p)
+            if p in results:
+                continue
+            key = os.path.abspath(p)
+            try:
+                st = os.stat(p)
+            except OSError:
+                results[p] = FileCheck(False, "unknown", False)
+                continue
+            stamp = [st.st_size, st.st_mtime_ns]
+            known = self._entries.get(key)
+            if known and known[:2] == stamp:
+                results[p] = FileCheck(*known[2:])
+                self.hits += 1
+            else:
+                todo.append((p, key, stamp))
+                results[p] = None
+
+        if todo:
+            if len(todo) > 1 and workers > 1:
+                with ThreadPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+                    checked = list(pool.map(check_file, [p for p, _, _ in todo]))
+            else:
+                checked = [check_file(p) for p, _, _ in todo]
+            for (p, key, stamp), res in zip(todo, checked):
+                results[p] = res
+                self._entries[key] = stamp + list(res)
+            self.misses += len(todo)
+            self._dirty = True
+        return results
+
+    def check(self, path: Union[str, os.PathLike]) -> FileCheck:
+        return self.check_many([path])[os.fspath(path)]
+
+    def save(self):
+        """Записывает кэш (если что‑то проверялось), выбрасывая удалённые файлы"""
+        if not self._dirty:
+            return
+        entries = {k: v for k, v in self._entries.items() if os.path.exists(k)}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._entries = entries
+            self._dirty = False
+        except OSError as e:
+            print(f"[EncodingCheckCache] Не удалось сохранить кэш: {e}")
@@ -1,150 +1,1188 @@
-import re
-import json
-from dataclasses import dataclass, asdict
-from typing import Optional, Dict, Any, List, DefaultDict
-from collections import defaultdict
-
-# 🔹 Используем Python‑файл с паттернами
-from error_patterns import error_patterns
-
-
-# ─────────────────────────────────────────────
-# 📘 Dataclass — ParsedError
-# ─────────────────────────────────────────────
-@dataclass(eq=True)
-class ParsedError:
-    """Нормализованная структура ошибки из CK3‑лога"""
-    category: str
-    type: str
-    file: Optional[str] = None
-    line: Optional[str] = None
-    key: Optional[str] = None
-    element: Optional[str] = None
-    message: Optional[str] = None
-    log_line: Optional[int] = None
-
-    def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
-
-    def to_json(self) -> str:
-        return json.dumps(asdict(self), ensure_ascii=False, indent=2)
-
-
-# ─────────────────────────────────────────────
-# ⚙️ Основной класс‑классификатор
-# ─────────────────────────────────────────────
-class ErrorClassifier:
-    """
-    Класс‑классификатор логов CK3.
-    Теперь использует Python‑файл error_patterns.py вместо YAML.
-    """
-
-    def __init__(self, patterns: Optional[Dict[str, Any]] = None):
-        # 🔹 Подключаем словарь из error_patterns.py
-        self.patterns = patterns or error_patterns
-        self.compiled = self._compile_patterns(self.patterns)
-        print("📘 Загружены паттерны из Python (error_patterns.py)")
-
-    # ─────────────────────────────────────────
-    def _compile_patterns(self, patterns_dict=None):
-        """Компилирует все регулярные выражения из словаря pattern"""
-        compiled = []
-        patterns_dict = patterns_dict or self.patterns
-
-        for category, block in patterns_dict.items():
-            for p in block.get("patterns", []):
-                try:
-                    rgx = re.compile(p["regex"])
-                    compiled.append({
-                        "regex": rgx,
-                        "category": category,
-                        "type": p.get("type", "UNKNOWN")
-                    })
-                except re.error as e:
-                    print(f"[RegexError] {category}/{p.get('type')}: {e}")
-
-        return compiled
-
-    # ─────────────────────────────────────────
-    def classify_line(self, line: str) -> Optional[ParsedError]:
-        """Проверяет одну строку лога против всех паттернов"""
-        try:
-            for rule in self.compiled:
-                m = rule["regex"].search(line)
-                if m:
-                    data = m.groupdict()
-                    return ParsedError(
-                        category=rule["category"],
-                        type=rule["type"],
-                        file=data.get("file") or data.get("file1") or None,
-                        line=data.get("line"),
-                        key=data.get("key"),
-                        element=data.get("element"),
-                        message=data.get("message")
-                    )
-        except Exception as e:
-            print(f"[ErrorClassifier] Ошибка классификации строки: {e}\n→ {line.strip()}")
-        return None
-
-    # ─────────────────────────────────────────
-    def classify_block(self, text: str, deduplicate: bool = True) -> List[ParsedError]:
-        """Обрабатывает весь текст лог‑файла"""
-        results = []
-        seen = set()
-        for i, line in enumerate(text.splitlines(), start=1):
-            parsed = self.classify_line(line)
-            if not parsed:
-                continue
-            parsed.log_line = i
-
-            if deduplicate:
-                # ключ для защиты от дубликатов
-                key = (
-                    parsed.category,
-                    parsed.type,
-                    parsed.file,
-                    parsed.line,
-                    parsed.key,
-                    parsed.element,
-                    parsed.message,
-                )
-                if key in seen:
-                    continue
-                seen.add(key)
-
-            results.append(parsed)
-        return results
-
-    # ─────────────────────────────────────────
-    def group_by_category(self, errors: List[ParsedError]) -> DefaultDict[str, List[ParsedError]]:
-        """Группирует ParsedError по категориям"""
-        grouped: DefaultDict[str, List[ParsedError]] = defaultdict(list)
-        for e in errors:
-            grouped[e.category].append(e)
-        return grouped
-
-    # ─────────────────────────────────────────
-    def save_to_json(
-        self,
-        parsed_errors: List[ParsedError],
-        path: str,
-        group_by_category: bool = True
-    ):
-        """Сохраняет ошибки в JSON (по категориям или единым списком)"""
-        try:
-            unique_errors = list({e: None for e in parsed_errors}.keys())
-
-            if group_by_category:
-                grouped = defaultdict(list)
-                for e in unique_errors:
-                    grouped[e.category].append(e.to_dict())
-                data = [{"category": cat, "errors": grouped[cat]} for cat in sorted(grouped)]
-            else:
-                data = [e.to_dict() for e in unique_errors]
-
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            print(f"[✔] Отчёт сохранён: {path} (уникальных ошибок: {len(unique_errors)})")
-        except Exception as e:
-            print(f"[ErrorClassifier] Ошибка при сохранении JSON: {e}")
\ No newline at end of file
+import io
+import os
+import re
+import sys
+import codecs
+import json
+import time
+import hashlib
+from typing import (
+    Optional, Dict, Any, List, DefaultDict, FrozenSet, IO, Iterable, Iterator, Tuple, Union
+)
+from collections import defaultdict, OrderedDict
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+try:  # Python 3.11+
+    from re import _parser as _sre_parse
+    from re import _constants as _sre_const
+except ImportError:  # Python ≤ 3.10
+    import sre_parse as _sre_parse
+    import sre_constants as _sre_const
+
+# 🔹 Используем Python‑файл с паттернами
+from error_patterns import error_patterns
+# 🔹 ParsedError — окно на строку колоночного хранилища
+from error_store import ErrorStore, ParsedError, parse_clock, format_clock
+# 🔹 Сжатые / zip‑логи читаются потоком
+from log_archive import is_archive, open_log_stream
+
+
+# ─────────────────────────────────────────────
+# 🔎 Литеральные якоря для префильтра
+# ─────────────────────────────────────────────
+# Якоря короче этого значения не отсекают почти ничего — такие правила
+# считаются «без якоря» и проверяются на каждой строке.
+MIN_ANCHOR_LEN = 3
+
+
+def extract_anchor(regex: str, flags: int = 0) -> Optional[str]:
+    """
+    Возвращает самый длинный литерал, который обязан присутствовать в любой
+    строке, совпадающей с regex (или None, если такого литерала нет).
+
+    Учитываются только литералы верхнего уровня (и внутри обычных групп):
+    всё, что стоит под `?`, `*`, `|` и т.п., разрывает последовательность.
+    """
+    if flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = _sre_parse.parse(regex, flags)
+    except re.error:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+
+    runs: List[str] = []
+    current: List[str] = []
+
+    def walk(items):
+        for op, av in items:
+            if op is _sre_const.LITERAL:
+                current.append(chr(av))
+            elif op is _sre_const.SUBPATTERN and not (av[1] & re.IGNORECASE):
+                # (group, add_flags, del_flags, pattern) — группа без флагов
+                # обязательна целиком, её литералы продолжают текущий фрагмент
+                walk(av[-1])
+            else:
+                if current:
+                    runs.append("".join(current))
+                    current.clear()
+
+    walk(parsed)
+    if current:
+        runs.append("".join(current))
+
+    best = max(runs, key=len, default="")
+    return best if len(best) >= MIN_ANCHOR_LEN else None
+
+
+# ─────────────────────────────────────────────
+# 💾 Кэш паттернов
+# ─────────────────────────────────────────────
+# Меняется вместе с форматом кэша или логикой извлечения якорей
+PATTERN_CACHE_VERSION = 1
+
+
+def pattern_fingerprint(patterns: Dict[str, Any]) -> str:
+    """Хэш словаря паттернов (+ версия кэша и Python — от неё зависит sre)"""
+    h = hashlib.sha256()
+    h.update(f"{PATTERN_CACHE_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:".encode())
+    h.update(json.dumps(patterns, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+class LazyPattern:
+    """
+    Обёртка над regex, компилируемым при первом search().
+    После компиляции search указывает прямо на re.Pattern.search.
+    """
+
+    __slots__ = ("pattern", "search")
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.search = self._compile_and_search
+
+    def _compile_and_search(self, string: str, *args):
+        rx = re.compile(self.pattern)
+        self.search = rx.search
+        return rx.search(string, *args)
+
+
+# ─────────────────────────────────────────────
+# 🕒 Префикс строки лога
+# ─────────────────────────────────────────────
+# Размер LRU‑кэша повторяющихся строк по умолчанию (0 — кэш выключен)
+LINE_CACHE_SIZE = 4096
+
+# Через сколько профилированных строк пересобирать порядок правил (adaptive)
+ADAPT_INTERVAL = 20000
+
+# Маркер отсутствия записи в кэше (None — закэшированное «не совпало»)
+_MISSING = object()
+
+
+def split_log_prefix(line: str) -> Tuple[Optional[int], Optional[str], str]:
+    """
+    «[12:01:33][jomini_script_system.cpp:123]: text» →
+    (43293, "jomini_script_system.cpp", "text").
+
+    Разбор по фиксированным позициям, без regex; строка без префикса
+    возвращается как (None, None, line).
+    """
+    if (len(line) > 11 and line[0] == "[" and line[3] == ":" and line[6] == ":"
+            and line[9] == "]" and line[10] == "["):
+        end = line.find("]", 11)
+        hh, mm, ss = line[1:3], line[4:6], line[7:9]
+        if end > 0 and hh.isdigit() and mm.isdigit() and ss.isdigit():
+            seconds = int(hh) * 3600 + int(mm) * 60 + int(ss)
+            tag = line[11:end]
+            src, sep, num = tag.rpartition(":")
+            source = src if sep and num.isdigit() else tag
+            rest = line[end + 1:]
+            if rest.startswith(":"):
+                rest = rest[1:]
+            return seconds, sys.intern(source), rest.lstrip()
+    return None, None, line
+
+
+def strip_log_prefix(line: str) -> str:
+    """Отбрасывает префикс «[hh:mm:ss][source.cpp:N]:», если он есть"""
+    return split_log_prefix(line)[2]
+
+
+# ─────────────────────────────────────────────
+# 📖 Потоковое чтение лога
+# ─────────────────────────────────────────────
+# Размер блока чтения для iter_classify
+READ_CHUNK_SIZE = 1 << 20
+
+
+def iter_raw_lines(
+    f: IO[bytes], chunk_size: int = READ_CHUNK_SIZE, limit: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Читает бинарный поток блоками и отдаёт строки без b"\\n" / b"\\r\\n".
+    Незавершённый хвост переносится в следующий блок.
+    limit — сколько байт прочитать от текущей позиции (None — до конца).
+    """
+    tail = b""
+    while True:
+        if limit is None:
+            chunk = f.read(chunk_size)
+        else:
+            chunk = f.read(min(chunk_size, limit))
+            limit -= len(chunk)
+        if not chunk:
+            break
+        if tail:
+            chunk = tail + chunk
+        lines = chunk.split(b"\n")
+        tail = lines.pop()
+        for raw in lines:
+            yield raw[:-1] if raw.endswith(b"\r") else raw
+    if tail:
+        yield tail[:-1] if tail.endswith(b"\r") else tail
+
+
+# BOM, по которым кодеки «utf-16»/«utf-32» узнают порядок байт
+_UNICODE_BOMS = {
+    "utf-16": (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE),
+    "utf-32": (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE),
+}
+
+
+class _LimitedReader(io.RawIOBase):
+    """
+    Не больше limit байт бинарного потока (None — до конца); закрытие
+    обёртки исходный поток не закрывает.
+    """
+
+    def __init__(self, f: IO[bytes], limit: Optional[int] = None):
+        super().__init__()
+        self._f = f
+        self._left = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        n = len(b) if self._left is None else min(len(b), self._left)
+        data = self._f.read(n) if n else b""
+        b[:len(data)] = data
+        if self._left is not None:
+            self._left -= len(data)
+        return len(data)
+
+
+def iter_decoded_lines(
+    f: IO[bytes],
+    encoding: str = "utf-8",
+    chunk_size: int = READ_CHUNK_SIZE,
+    limit: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Строки бинарного потока, декодированные по одной. Кодировки, не
+    совместимые с ASCII (UTF‑16/32), делить по байту b"\n" нельзя —
+    такой поток декодируется целиком через TextIOWrapper.
+    """
+    if not ascii_compatible(encoding):
+        buf = io.BufferedReader(_LimitedReader(f, limit), chunk_size)
+        # «utf-16»/«utf-32» без BOM (чтение с середины файла) — little-endian, как в Windows
+        boms = _UNICODE_BOMS.get(codecs.lookup(encoding).name)
+        if boms and not buf.peek(4).startswith(boms):
+            encoding += "-le"
+        text = io.TextIOWrapper(buf, encoding=encoding, errors="replace", newline="\n")
+        for line in text:
+            if line.endswith("\n"):
+                line = line[:-1]
+            yield line[:-1] if line.endswith("\r") else line
+        return
+    for raw in iter_raw_lines(f, chunk_size, limit):
+        yield raw.decode(encoding, errors="replace")
+
+
+def ascii_compatible(encoding: str) -> bool:
+    """
+    Байты 0x00–0x7F в этой кодировке — всегда ASCII и только ASCII
+    (UTF‑8 и однобайтовые кодовые страницы). Тогда ASCII‑якорь можно
+    искать прямо в байтах.
+    """
+    try:
+        if codecs.lookup(encoding).name == "utf-8":
+            return True
+        table = bytes(range(256)).decode(encoding, errors="replace")
+    except LookupError:
+        return False
+    return len(table) == 256 and table[:128] == "".join(map(chr, range(128)))
+
+
+# Длина подстрок‑«триггеров» байтового префильтра
+TRIGGER_LEN = 5
+# Если кандидатов в блоке больше этой доли строк, префильтр только мешает —
+# дальше строки декодируются все подряд
+DENSE_RATIO = 0.5
+
+
+def literal_cover(literals: Iterable[bytes], size: int = TRIGGER_LEN) -> List[bytes]:
+    """
+    Небольшой набор подстрок длины size (короткие литералы — целиком),
+    такой что в каждом литерале есть хотя бы одна из них. Жадно: каждый
+    раз берётся подстрока, общая для наибольшего числа оставшихся.
+    """
+    left = set(literals)
+    cover: List[bytes] = []
+    while left:
+        counts: Dict[bytes, int] = defaultdict(int)
+        for lit in left:
+            grams = {lit} if len(lit) <= size else {
+                lit[i:i + size] for i in range(len(lit) - size + 1)}
+            for g in grams:
+                counts[g] += 1
+        best = max(sorted(counts), key=counts.__getitem__)
+        cover.append(best)
+        left = {lit for lit in left if best not in lit}
+    return cover
+
+
+class BytesPrefilter:
+    """
+    Префильтр якорей по сырым байтам блока лога.
+
+    Альтернатива из десятков литералов в re проверяет каждую позицию
+    буфера, а поиск одного литерала (bytes.find) идёт на порядок быстрее.
+    Поэтому блок просматривается по нескольким коротким триггерам
+    (literal_cover якорей), а найденные строки перепроверяются полной
+    альтернативой якорей — уже только в пределах строки.
+    """
+
+    __slots__ = ("triggers", "line_rx")
+
+    def __init__(self, anchors: Iterable[bytes]):
+        anchors = sorted(set(anchors), key=len, reverse=True)
+        self.triggers = literal_cover(anchors)
+        self.line_rx = re.compile(b"|".join(re.escape(a) for a in anchors))
+
+    def line_starts(self, buf: bytes) -> List[int]:
+        """Начала строк буфера, где есть хотя бы один якорь (по порядку)"""
+        starts = set()
+        find, rfind = buf.find, buf.rfind
+        for trig in self.triggers:
+            i = find(trig)
+            while i >= 0:
+                starts.add(rfind(b"\n", 0, i) + 1)
+                end = find(b"\n", i)
+                if end < 0:
+                    break
+                i = find(trig, end)
+        search = self.line_rx.search
+        hits = []
+        for start in sorted(starts):
+            end = find(b"\n", start)
+            if search(buf, start, end if end >= 0 else len(buf)):
+                hits.append(start)
+        return hits
+
+
+def iter_candidate_lines(
+    f: IO[bytes],
+    prefilter: BytesPrefilter,
+    encoding: str = "utf-8",
+    chunk_size: int = READ_CHUNK_SIZE,
+    limit: Optional[int] = None,
+    first_line: int = 1,
+) -> Iterator[Tuple[int, str]]:
+    """
+    (номер строки с first_line, строка) только для строк, в сырых байтах
+    которых есть якорь префильтра. Поиск идёт по всему блоку сразу, номера
+    строк — через bytes.count(b"\\n"), декодируются лишь найденные строки
+    (так же, как в iter_decoded_lines).
+
+    Лог, где кандидатов больше DENSE_RATIO строк, дальше читается без
+    префильтра (отдаются все строки) — классификатор их всё равно отсеет.
+    """
+    line = first_line
+    tail = b""
+    dense = False
+    while True:
+        if limit is None:
+            chunk = f.read(chunk_size)
+        else:
+            chunk = f.read(min(chunk_size, limit))
+            limit -= len(chunk)
+        if chunk:
+            buf = tail + chunk if tail else chunk
+            cut = buf.rfind(b"\n") + 1
+            buf, tail = buf[:cut], buf[cut:]
+        else:
+            # последняя строка без b"\n"
+            buf, tail = tail, b""
+        if dense:
+            raws = buf.split(b"\n")
+            if not chunk and buf:
+                raws.append(b"")
+            for raw in islice(raws, len(raws) - 1):
+                yield line, (raw[:-1] if raw.endswith(b"\r") else raw).decode(encoding, errors="replace")
+                line += 1
+            if not chunk:
+                break
+            continue
+        pos = 0
+        starts = prefilter.line_starts(buf)
+        if len(starts) > DENSE_RATIO * (buf.count(b"\n") + 1):
+            dense = True
+        for start in starts:
+            end = buf.find(b"\n", start)
+            if end < 0:
+                end = len(buf)
+            line += buf.count(b"\n", pos, start)
+            raw = buf[start:end]
+            yield line, (raw[:-1] if raw.endswith(b"\r") else raw).decode(encoding, errors="replace")
+            line += 1
+            pos = end + 1
+        if pos < len(buf):
+            line += buf.count(b"\n", pos)
+        if not chunk:
+            break
+
+
+# ─────────────────────────────────────────────
+# 🧵 Параллельный режим (процессы‑воркеры)
+# ─────────────────────────────────────────────
+# Файлы меньше этого размера быстрее обработать в одном процессе
+PARALLEL_MIN_SIZE = 32 << 20
+# Минимальный размер диапазона, отдаваемого одному воркеру
+MIN_RANGE_SIZE = 4 << 20
+
+
+def split_line_ranges(
+    path: Union[str, os.PathLike], parts: int, start: int = 0, end: Optional[int] = None
+) -> List[tuple]:
+    """
+    Делит файл (или его участок [start, end)) на ~parts диапазонов
+    (start, end) в байтах. Каждая граница стоит сразу после b"\\n",
+    т.е. строки не разрываются (start должен быть началом строки).
+    """
+    size = os.path.getsize(path) if end is None else end
+    step = max((size - start) // max(parts, 1), MIN_RANGE_SIZE)
+    bounds = [start]
+    with open(path, "rb") as f:
+        pos = start + step
+        while pos < size:
+            f.seek(pos)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            bounds.append(pos)
+            pos += step
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+# Классификатор воркера — создаётся один раз в _init_worker
+_worker_classifier: Optional["ErrorClassifier"] = None
+
+
+def _init_worker(
+    patterns: Dict[str, Any],
+    profile: bool = False,
+    adaptive: bool = False,
+    cache_path: Optional[str] = None,
+):
+    """Инициализатор процесса: компилирует паттерны один раз"""
+    global _worker_classifier
+    _worker_classifier = ErrorClassifier(
+        patterns, verbose=False, profile=profile, adaptive=adaptive, cache_path=cache_path)
+
+
+def _classify_range(
+    path: str,
+    start: int,
+    end: int,
+    encoding: str,
+    deduplicate: bool,
+    sample_size: int = 0,
+    bytes_mode: bool = True,
+):
+    """
+    Классифицирует диапазон [start, end) файла.
+    Возвращает (записи [log_line, time, source, count, last_log_line, sample,
+    *поля], число строк в диапазоне, статистику профилировщика или None);
+    номера строк локальные (с 1), смещение добавляет родительский процесс.
+    При deduplicate повторы внутри диапазона сворачиваются в count.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    n_lines = data.count(b"\n")
+    if data and not data.endswith(b"\n"):
+        n_lines += 1
+    rows = []
+    groups: Dict[tuple, list] = {}
+    lines = _worker_classifier._numbered_lines(io.BytesIO(data), encoding, bytes_mode=bytes_mode)
+    for i, seconds, source, fields in _worker_classifier._matches(lines):
+        if deduplicate:
+            group = groups.get(fields)
+            if group is not None:
+                # повтор: [log_line, time, source, count, last_log_line, sample, ...]
+                group[3] += 1
+                group[4] = i
+                if len(group[5]) < sample_size:
+                    group[5].append(i)
+                continue
+        group = [i, seconds, source, 1, i, [i] if sample_size else []]
+        group.extend(fields)
+        if deduplicate:
+            groups[fields] = group
+        rows.append(group)
+    clf = _worker_classifier
+    profile = None
+    if clf.profile:
+        profile = (clf._stats, clf.profiled_lines, clf.precedence_fixes)
+        # порядок adaptive сохраняется, счётчики считаются заново
+        clf._stats = [[0, 0, 0] for _ in clf.compiled]
+        clf.profiled_lines = 0
+        clf.precedence_fixes = 0
+        clf._next_reorder = ADAPT_INTERVAL
+    return rows, n_lines, profile
+
+
+# ─────────────────────────────────────────────
+# ⚙️ Основной класс‑классификатор
+# ─────────────────────────────────────────────
+class ErrorClassifier:
+    """
+    Класс‑классификатор логов CK3.
+    Теперь использует Python‑файл error_patterns.py вместо YAML.
+    """
+
+    def __init__(
+        self,
+        patterns: Optional[Dict[str, Any]] = None,
+        verbose: bool = True,
+        cache_size: int = LINE_CACHE_SIZE,
+        profile: bool = False,
+        adaptive: bool = False,
+        cache_path: Optional[Union[str, os.PathLike]] = None,
+    ):
+        # 🔹 Подключаем словарь из error_patterns.py
+        self.patterns = patterns or error_patterns
+        # 🔹 cache_path — файл с уже проверенными правилами и их якорями;
+        #    при совпадении отпечатка паттерны не валидируются заново
+        self.cache_path = cache_path
+        self.fingerprint = pattern_fingerprint(self.patterns)
+        self.compiled = self._load_pattern_cache() if cache_path else None
+        if self.compiled is None:
+            self.compiled = self._compile_patterns(self.patterns)
+            if cache_path:
+                self._save_pattern_cache()
+        self._build_prefilter()
+        # 🔹 Профилирование правил: [попытки, совпадения, время нс] на правило.
+        #    adaptive — порядок проверки по частоте совпадений (включает profile)
+        self.adaptive = adaptive
+        self.profile = profile or adaptive
+        self._order: List[Dict[str, Any]] = list(self.compiled)
+        self.reset_profile()
+        # 🔹 LRU‑кэш: текст строки без префикса → кортеж полей (или None)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Optional[tuple]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        if verbose:
+            print("📘 Загружены паттерны из Python (error_patterns.py)")
+
+    # ─────────────────────────────────────────
+    def _compile_patterns(self, patterns_dict=None):
+        """Компилирует все регулярные выражения из словаря pattern"""
+        compiled = []
+        patterns_dict = patterns_dict or self.patterns
+
+        for category, block in patterns_dict.items():
+            for p in block.get("patterns", []):
+                try:
+                    rgx = re.compile(p["regex"])
+                    compiled.append({
+                        "index": len(compiled),
+                        "regex": rgx,
+                        "category": category,
+                        "type": p.get("type", "UNKNOWN"),
+                        "anchor": extract_anchor(p["regex"]),
+                    })
+                except re.error as e:
+                    print(f"[RegexError] {category}/{p.get('type')}: {e}")
+
+        return compiled
+
+    # ─────────────────────────────────────────
+    def _load_pattern_cache(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Читает правила из кэша, если отпечаток паттернов не изменился.
+        Regex в этом случае компилируются лениво — при первой проверке.
+        """
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("fingerprint") != self.fingerprint:
+            return None
+        return [
+            {
+                "index": i,
+                "regex": LazyPattern(r["regex"]),
+                "category": r["category"],
+                "type": r["type"],
+                "anchor": r["anchor"],
+            }
+            for i, r in enumerate(data.get("rules", []))
+        ]
+
+    def _save_pattern_cache(self):
+        """Сохраняет проверенные правила и якоря рядом с config.json"""
+        data = {
+            "fingerprint": self.fingerprint,
+            "rules": [
+                {
+                    "category": r["category"],
+                    "type": r["type"],
+                    "regex": r["regex"].pattern,
+                    "anchor": r["anchor"],
+                }
+                for r in self.compiled
+            ],
+        }
+        try:
+            path = os.fspath(self.cache_path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[ErrorClassifier] Не удалось сохранить кэш паттернов: {e}")
+
+    # ─────────────────────────────────────────
+    def _build_prefilter(self):
+        """
+        Собирает один regex‑префильтр из якорей всех правил.
+
+        Lookahead‑альтернатива находит якоря, начинающиеся в каждой позиции
+        строки, за один проход. Якоря, вложенные в найденный (например
+        «Error:» внутри «VFSOpen Error:»), добавляются через замыкание.
+        """
+        anchors = sorted({r["anchor"] for r in self.compiled if r["anchor"]},
+                         key=len, reverse=True)
+        self._has_unanchored = any(r["anchor"] is None for r in self.compiled)
+        self._anchor_closure: Dict[str, FrozenSet[str]] = {
+            a: frozenset(b for b in anchors if b in a) for a in anchors
+        }
+        if anchors:
+            alternation = "|".join(re.escape(a) for a in anchors)
+            self._anchor_rx = re.compile(f"(?=({alternation}))")
+        else:
+            self._anchor_rx = None
+        # байтовые версии префильтра по кодировкам (см. bytes_prefilter)
+        self._bytes_prefilters: Dict[str, Optional[BytesPrefilter]] = {}
+
+    def bytes_prefilter(self, encoding: str) -> Optional[BytesPrefilter]:
+        """
+        Префильтр для сырых байтов лога в кодировке encoding: есть
+        совпадение ⇔ в строке есть хотя бы один якорь.
+
+        None — байтовый путь невозможен: есть правила без якоря (строку
+        надо проверять всегда) или кодировка не совместима с ASCII и якоря
+        нельзя искать в байтах.
+        """
+        key = encoding.lower()
+        if key not in self._bytes_prefilters:
+            rx = None
+            anchors = self._anchor_closure.keys()
+            if anchors and not self._has_unanchored and ascii_compatible(encoding):
+                # utf-8-sig дописывает BOM перед каждой закодированной строкой
+                codec = "utf-8" if codecs.lookup(encoding).name == "utf-8-sig" else encoding
+                try:
+                    rx = BytesPrefilter(a.encode(codec) for a in anchors)
+                except UnicodeEncodeError:
+                    rx = None
+            self._bytes_prefilters[key] = rx
+        return self._bytes_prefilters[key]
+
+    def _anchors_in(self, line: str) -> FrozenSet[str]:
+        """Множество якорей, присутствующих в строке"""
+        if self._anchor_rx is None:
+            return frozenset()
+        found = self._anchor_rx.findall(line)
+        if not found:
+            return frozenset()
+        if len(found) == 1:
+            return self._anchor_closure[found[0]]
+        hits = set()
+        for a in found:
+            hits |= self._anchor_closure[a]
+        return frozenset(hits)
+
+    # ─────────────────────────────────────────
+    def _match_fields(self, text: str) -> Optional[tuple]:
+        """
+        Ищет первое совпадающее правило и возвращает кортеж полей
+        (category, type, file, line, key, element, message) или None.
+
+        Сначала префильтр ищет литеральные якоря; regex запускается только
+        у правил, чей якорь есть в строке (и у правил без якоря). Порядок
+        правил сохраняется — по‑прежнему побеждает первое совпадение.
+        """
+        if self.profile:
+            return self._match_fields_profiled(text)
+        try:
+            hits = self._anchors_in(text)
+            if not hits and not self._has_unanchored:
+                return None
+            for rule in self.compiled:
+                anchor = rule["anchor"]
+                if anchor is not None and anchor not in hits:
+                    continue
+                m = rule["regex"].search(text)
+                if m:
+                    data = m.groupdict()
+                    return (
+                        rule["category"],
+                        rule["type"],
+                        data.get("file") or data.get("file1") or None,
+                        data.get("line"),
+                        data.get("key"),
+                        data.get("element"),
+                        data.get("message"),
+                    )
+        except Exception as e:
+            print(f"[ErrorClassifier] Ошибка классификации строки: {e}\n→ {text.strip()}")
+        return None
+
+    # ─────────────────────────────────────────
+    def _match_fields_profiled(self, text: str) -> Optional[tuple]:
+        """
+        _match_fields с учётом попыток, совпадений и времени каждого правила.
+
+        В режиме adaptive правила проверяются в порядке self._order. Чтобы
+        результат не менялся, после совпадения дополнительно проверяются ещё
+        не опробованные кандидаты с более высоким исходным приоритетом:
+        побеждает совпавшее правило с наименьшим "index", как и без adaptive.
+        """
+        stats = self._stats
+        clock = time.perf_counter_ns
+        self.profiled_lines += 1
+        try:
+            hits = self._anchors_in(text)
+            if not hits and not self._has_unanchored:
+                return None
+            candidates = [
+                r for r in self._order
+                if r["anchor"] is None or r["anchor"] in hits
+            ]
+            for pos, rule in enumerate(candidates):
+                st = stats[rule["index"]]
+                t0 = clock()
+                m = rule["regex"].search(text)
+                st[2] += clock() - t0
+                st[0] += 1
+                if not m:
+                    continue
+                st[1] += 1
+
+                if self.adaptive:
+                    earlier = sorted(
+                        (r for r in candidates[pos + 1:] if r["index"] < rule["index"]),
+                        key=lambda r: r["index"],
+                    )
+                    for r2 in earlier:
+                        st2 = stats[r2["index"]]
+                        t0 = clock()
+                        m2 = r2["regex"].search(text)
+                        st2[2] += clock() - t0
+                        st2[0] += 1
+                        if m2:
+                            st2[1] += 1
+                            self.precedence_fixes += 1
+                            rule, m = r2, m2
+                            break
+
+                self._maybe_reorder()
+                data = m.groupdict()
+                return (
+                    rule["category"],
+                    rule["type"],
+                    data.get("file") or data.get("file1") or None,
+                    data.get("line"),
+                    data.get("key"),
+                    data.get("element"),
+                    data.get("message"),
+                )
+        except Exception as e:
+            print(f"[ErrorClassifier] Ошибка классификации строки: {e}\n→ {text.strip()}")
+        return None
+
+    # ─────────────────────────────────────────
+    def _maybe_reorder(self):
+        """В режиме adaptive периодически пересобирает порядок правил"""
+        if self.adaptive and self.profiled_lines >= self._next_reorder:
+            self.reorder_rules()
+            self._next_reorder = self.profiled_lines + ADAPT_INTERVAL
+
+    def reorder_rules(self):
+        """
+        Упорядочивает правила по доле совпадений (hits / attempts).
+
+        Результат от порядка не зависит только благодаря проверке
+        старшинства в _match_fields_profiled: совпавшее правило
+        принимается, лишь если ни одно правило, стоящее раньше в исходном
+        порядке, тоже не совпадает (иначе побеждает оно, precedence_fixes).
+        Без этой проверки перестановка меняла бы классификацию.
+
+        Правила с одинаковым якорем (например, четыре «Unrecognized loc
+        key») переставляются группой и сохраняют исходный порядок внутри
+        неё: regex у них разные, но строки часто подходят нескольким
+        сразу, и так проверке не приходится перебирать группу заново.
+        """
+        groups: Dict[Any, List[Dict[str, Any]]] = {}
+        for rule in self.compiled:
+            # у правил без якоря — собственная группа
+            groups.setdefault(rule["anchor"] or ("#", rule["index"]), []).append(rule)
+
+        def rate(rule):
+            attempts, hits, _ = self._stats[rule["index"]]
+            return hits / attempts if attempts else 0.0
+
+        ordered = sorted(
+            groups.values(),
+            key=lambda g: (-max(rate(r) for r in g), g[0]["index"]),
+        )
+        self._order = [r for g in ordered for r in g]
+
+    def reset_profile(self):
+        """Обнуляет статистику правил и возвращает исходный порядок"""
+        self._stats = [[0, 0, 0] for _ in self.compiled]
+        self.profiled_lines = 0
+        self.precedence_fixes = 0
+        self._next_reorder = ADAPT_INTERVAL
+        self._order = list(self.compiled)
+
+    # ─────────────────────────────────────────
+    def profile_stats(self) -> List[Dict[str, Any]]:
+        """Статистика по правилам, самые «дорогие» по времени — первыми"""
+        rows = []
+        for rule in self.compiled:
+            attempts, hits, ns = self._stats[rule["index"]]
+            rows.append({
+                "category": rule["category"],
+                "type": rule["type"],
+                "anchor": rule["anchor"],
+                "attempts": attempts,
+                "hits": hits,
+                "hit_rate": round(hits / attempts, 4) if attempts else 0.0,
+                "time_ms": round(ns / 1e6, 3),
+            })
+        rows.sort(key=lambda r: (-r["time_ms"], -r["attempts"]))
+        return rows
+
+    def profile_table(self) -> str:
+        """Статистика правил в виде текстовой таблицы"""
+        header = f"{'TYPE':<32} {'ATTEMPTS':>10} {'HITS':>10} {'RATE':>7} {'TIME ms':>10}"
+        lines = [header, "─" * len(header)]
+        for r in self.profile_stats():
+            lines.append(
+                f"{r['type']:<32} {r['attempts']:>10} {r['hits']:>10} "
+                f"{r['hit_rate']:>7.2%} {r['time_ms']:>10.3f}"
+            )
+        lines.append(
+            f"lines: {self.profiled_lines}, precedence fixes: {self.precedence_fixes}"
+        )
+        return "\n".join(lines)
+
+    def dump_profile(self, path: str):
+        """Сохраняет статистику правил в JSON"""
+        data = {
+            "lines": self.profiled_lines,
+            "precedence_fixes": self.precedence_fixes,
+            "order": [r["type"] for r in self._order],
+            "rules": self.profile_stats(),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def _merge_profile(self, stats: List[List[int]], lines: int, fixes: int):
+        """Добавляет статистику воркера параллельного режима"""
+        for own, other in zip(self._stats, stats):
+            own[0] += other[0]
+            own[1] += other[1]
+            own[2] += other[2]
+        self.profiled_lines += lines
+        self.precedence_fixes += fixes
+
+    # ─────────────────────────────────────────
+    def _classify_text(self, text: str) -> Optional[tuple]:
+        """
+        Кортеж полей для текста строки лога без префикса (или None).
+
+        Результат ищется в LRU‑кэше по самому тексту, и повторяющиеся
+        сообщения (отличаются только временем) вообще не проходят через regex.
+        """
+        if not self.cache_size:
+            return self._match_fields(text)
+
+        cache = self._cache
+        fields = cache.get(text, _MISSING)
+        if fields is _MISSING:
+            self.cache_misses += 1
+            fields = self._match_fields(text)
+            cache[text] = fields
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        else:
+            self.cache_hits += 1
+            cache.move_to_end(text)
+        return fields
+
+    def _classify_fields(self, line: str) -> Optional[tuple]:
+        """Кортеж полей для полной строки лога (префикс отбрасывается)"""
+        return self._classify_text(split_log_prefix(line)[2])
+
+    def classify_line(self, line: str) -> Optional[ParsedError]:
+        """
+        Проверяет одну строку лога против паттернов.
+        Время и источник берутся из префикса «[hh:mm:ss][source.cpp:N]:».
+        """
+        seconds, source, text = split_log_prefix(line)
+        fields = self._classify_text(text)
+        if not fields:
+            return None
+        return ParsedError(*fields, time=seconds, source=source)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Статистика LRU‑кэша строк (для подбора cache_size)"""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+        }
+
+    def cache_clear(self):
+        """Очищает кэш строк и обнуляет счётчики"""
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ─────────────────────────────────────────
+    def _classify_lines(
+        self,
+        lines: Iterable[str],
+        deduplicate: bool = True,
+        start: int = 1,
+        store: Optional[ErrorStore] = None,
+    ) -> Iterator[ParsedError]:
+        """
+        Общий конвейер для classify_block и iter_classify.
+        Найденные ошибки дописываются в store (или в новый ErrorStore) и
+        отдаются как окна на его строки.
+
+        deduplicate=True — повторы не теряются, а считаются: отпечаток ошибки
+        (кортеж id интернированных строк; время и источник не входят) ведёт
+        store.add_occurrence, наружу отдаётся только первое вхождение. Его
+        count и last_log_line растут до конца прохода.
+        """
+        return self._classify_numbered(enumerate(lines, start=start), deduplicate, store)
+
+    def _classify_numbered(
+        self,
+        lines: Iterable[Tuple[int, str]],
+        deduplicate: bool = True,
+        store: Optional[ErrorStore] = None,
+    ) -> Iterator[ParsedError]:
+        """_classify_lines для пар (номер строки, строка) — с пропусками"""
+        if store is None:
+            store = ErrorStore()
+        view = ParsedError._view
+        add = store.add_occurrence
+        for i, seconds, source, fields in self._matches(lines):
+            ids = store.intern_fields(fields)
+
+            if deduplicate:
+                row, new = add(ids, i, seconds, source)
+                if new:
+                    yield view(store, row)
+            else:
+                yield view(store, store.append_ids(ids, i, seconds, source))
+
+    def _matches(
+        self, lines: Iterable[Tuple[int, str]]
+    ) -> Iterator[Tuple[int, Optional[int], Optional[str], tuple]]:
+        """(номер, время, источник, поля) совпавших строк — без хранилища"""
+        for i, line in lines:
+            seconds, source, text = split_log_prefix(line)
+            fields = self._classify_text(text)
+            if fields:
+                yield i, seconds, source, fields
+
+    def iter_matches(
+        self,
+        source: Union[str, os.PathLike, IO[bytes]],
+        encoding: str = "utf-8",
+        chunk_size: int = READ_CHUNK_SIZE,
+        bytes_mode: bool = True,
+    ) -> Iterator[Tuple[int, Optional[int], Optional[str], tuple]]:
+        """
+        Совпадения лога как кортежи (log_line, time, source, поля) — без
+        ErrorStore и без свёртки повторов. Годится для чтения в отдельном
+        потоке: общее хранилище наполняет тот, кто собирает результаты
+        (см. log_merge). Путь к архиву читается с распаковкой на лету.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open_log_stream(source) as f:
+                yield from self._matches(
+                    self._numbered_lines(f, encoding, chunk_size, bytes_mode=bytes_mode))
+        else:
+            yield from self._matches(
+                self._numbered_lines(source, encoding, chunk_size, bytes_mode=bytes_mode))
+
+    # ─────────────────────────────────────────
+    def classify_block(
+        self, text: str, deduplicate: bool = True, store: Optional[ErrorStore] = None
+    ) -> List[ParsedError]:
+        """Обрабатывает весь текст лог‑файла"""
+        return list(self._classify_lines(text.splitlines(), deduplicate, store=store))
+
+    # ─────────────────────────────────────────
+    def iter_classify(
+        self,
+        source: Union[str, os.PathLike, IO],
+        encoding: str = "utf-8",
+        deduplicate: bool = True,
+        chunk_size: int = READ_CHUNK_SIZE,
+        workers: Optional[int] = 1,
+        store: Optional[ErrorStore] = None,
+        start: int = 0,
+        end: Optional[int] = None,
+        first_line: int = 1,
+        bytes_mode: bool = True,
+    ) -> Iterator[ParsedError]:
+        """
+        Потоковая классификация: путь к логу или открытый файл.
+
+        Файл читается блоками по chunk_size байт, ParsedError отдаются по
+        мере нахождения (log_line — номер строки в файле, с 1). Память не
+        зависит от размера лога: повторы сворачиваются в счётчики (count).
+        Текстовые файловые объекты читаются построчно как есть.
+
+        workers != 1 (None — по числу ядер) включает параллельный режим для
+        файлов от PARALLEL_MIN_SIZE байт в ASCII‑совместимой кодировке;
+        результат тот же, что и у последовательного прохода.
+
+        Результаты дописываются в store (по умолчанию — новый ErrorStore).
+
+        Для пути можно задать участок файла [start, end) в байтах (start —
+        начало строки) и номер его первой строки first_line: так
+        дочитывается дописанный хвост лога (см. log_checkpoint).
+
+        Путь к .gz/.bz2/.xz/.zip (см. log_archive) читается как поток с
+        распаковкой на лету — последовательно, start/end не применяются.
+
+        bytes_mode — якоря префильтра ищутся прямо в сырых байтах блока,
+        декодируются только строки‑кандидаты (см. bytes_prefilter); результат
+        тот же, что и при декодировании каждой строки.
+        """
+        if store is None:
+            store = ErrorStore()
+        if isinstance(source, (str, os.PathLike)) and is_archive(source):
+            with open_log_stream(source) as f:
+                yield from self._classify_numbered(
+                    self._numbered_lines(f, encoding, chunk_size, bytes_mode=bytes_mode),
+                    deduplicate, store)
+        elif isinstance(source, (str, os.PathLike)):
+            if end is None:
+                end = os.path.getsize(source)
+            n_workers = workers or os.cpu_count() or 1
+            # диапазоны режутся по байту b"\n" — только для ASCII‑совместимых кодировок
+            if n_workers > 1 and end - start >= PARALLEL_MIN_SIZE and ascii_compatible(encoding):
+                yield from self._iter_classify_parallel(
+                    source, encoding, deduplicate, n_workers, store, start, end, first_line,
+                    bytes_mode)
+                return
+            with open(source, "rb") as f:
+                f.seek(start)
+                yield from self._classify_numbered(
+                    self._numbered_lines(
+                        f, encoding, chunk_size, end - start, first_line, bytes_mode),
+                    deduplicate, store)
+        elif isinstance(source, io.TextIOBase):
+            yield from self._classify_lines(
+                (line.rstrip("\r\n") for line in source), deduplicate, store=store)
+        else:
+            yield from self._classify_numbered(
+                self._numbered_lines(source, encoding, chunk_size, bytes_mode=bytes_mode),
+                deduplicate, store)
+
+    def _numbered_lines(
+        self,
+        f: IO[bytes],
+        encoding: str,
+        chunk_size: int = READ_CHUNK_SIZE,
+        limit: Optional[int] = None,
+        first_line: int = 1,
+        bytes_mode: bool = True,
+    ) -> Iterator[Tuple[int, str]]:
+        """(номер, строка) бинарного потока: только кандидаты или все строки"""
+        prefilter = self.bytes_prefilter(encoding) if bytes_mode else None
+        if prefilter is not None:
+            return iter_candidate_lines(f, prefilter, encoding, chunk_size, limit, first_line)
+        return enumerate(iter_decoded_lines(f, encoding, chunk_size, limit), start=first_line)
+
+    # ─────────────────────────────────────────
+    def _iter_classify_parallel(
+        self,
+        path: Union[str, os.PathLike],
+        encoding: str,
+        deduplicate: bool,
+        workers: int,
+        store: ErrorStore,
+        start: int = 0,
+        end: Optional[int] = None,
+        first_line: int = 1,
+        bytes_mode: bool = True,
+    ) -> Iterator[ParsedError]:
+        """
+        Делит файл на диапазоны байт по границам строк и классифицирует их в
+        ProcessPoolExecutor (паттерны компилируются один раз на процесс).
+        Результаты склеиваются в исходном порядке log_line.
+
+        Каждый диапазон сворачивает повторы локально (первое вхождение +
+        count, последнее вхождение, выборка позиций); слияние по порядку
+        диапазонов через store.add_occurrence даёт ровно то же, что и
+        последовательный проход.
+        """
+        ranges = split_line_ranges(path, workers * 4, start, end)
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.patterns, self.profile, self.adaptive, self.cache_path),
+        )
+        try:
+            view = ParsedError._view
+            line_offset = first_line - 1
+            jobs = [
+                pool.submit(
+                    _classify_range, os.fspath(path), lo, hi, encoding, deduplicate,
+                    store.sample_size, bytes_mode)
+                for lo, hi in ranges
+            ]
+            for job in jobs:
+                rows, n_lines, profile = job.result()
+                if profile:
+                    self._merge_profile(*profile)
+                for rec in rows:
+                    ids = store.intern_fields(tuple(rec[6:]))
+                    log_line = rec[0] + line_offset
+                    if deduplicate:
+                        row, new = store.add_occurrence(
+                            ids, log_line, rec[1], rec[2],
+                            count=rec[3],
+                            last_log_line=rec[4] + line_offset,
+                            sample=[n + line_offset for n in rec[5]],
+                        )
+                        if new:
+                            yield view(store, row)
+                    else:
+                        yield view(store, store.append_ids(ids, log_line, rec[1], rec[2]))
+                line_offset += n_lines
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ─────────────────────────────────────────
+    def group_by_category(
+        self, errors: Union[ErrorStore, List[ParsedError]]
+    ) -> DefaultDict[str, List[ParsedError]]:
+        """Группирует ParsedError по категориям (ErrorStore — по колонке id)"""
+        if isinstance(errors, ErrorStore):
+            return errors.group_by_category()
+        grouped: DefaultDict[str, List[ParsedError]] = defaultdict(list)
+        for e in errors:
+            grouped[e.category].append(e)
+        return grouped
+
+    # ─────────────────────────────────────────
+    def save_to_json(
+        self,
+        parsed_errors: Union[ErrorStore, List[ParsedError]],
+        path: str,
+        group_by_category: bool = True
+    ):
+        """Сохраняет ошибки в JSON (по категориям или единым списком)"""
+        try:
+            if isinstance(parsed_errors, ErrorStore):
+                # повторы уже свёрнуты при разборе (count / last_log_line)
+                store = parsed_errors
+                total = len(store)
+                if group_by_category:
+                    by_cat = store.rows_by_category()
+                    data = [
+                        {"category": cat, "errors": [store.to_dict(r) for r in by_cat[cat]]}
+                        for cat in sorted(by_cat)
+                    ]
+                else:
+                    data = [store.to_dict(r) for r in range(total)]
+            else:
+                total = len(parsed_errors)
+                if group_by_category:
+                    grouped = defaultdict(list)
+                    for e in parsed_errors:
+                        grouped[e.category].append(e.to_dict())
+                    data = [{"category": cat, "errors": grouped[cat]} for cat in sorted(grouped)]
+                else:
+                    data = [e.to_dict() for e in parsed_errors]
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+            print(f"[✔] Отчёт сохранён: {path} (уникальных ошибок: {total})")
+        except Exception as e:
+            print(f"[ErrorClassifier] Ошибка при сохранении JSON: {e}")
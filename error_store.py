@@ -0,0 +1,607 @@
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, DefaultDict, Iterable, Iterator, Tuple
+
+
+DAY_SECONDS = 24 * 3600
+# Время в логе откатилось больше чем на столько — значит, прошла полночь
+MIDNIGHT_JUMP = 12 * 3600
+
+
+def parse_clock(value: str) -> int:
+    """«12:01» / «12:01:30» → секунды от начала суток"""
+    parts = [int(p) for p in value.strip().split(":")]
+    while len(parts) < 3:
+        parts.append(0)
+    hh, mm, ss = parts[:3]
+    return hh * 3600 + mm * 60 + ss
+
+
+def format_clock(seconds: Optional[int]) -> str:
+    """Секунды → «hh:mm:ss» (пустая строка для None)"""
+    if seconds is None or seconds < 0:
+        return ""
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class SessionClock:
+    """
+    «[hh:mm:ss]» подряд идущих строк лога → секунды от полуночи первого
+    дня сессии: в логе нет даты, поэтому откат времени больше
+    MIDNIGHT_JUMP считается переходом через полночь.
+
+        clock = SessionClock()
+        clock.advance(parse_clock("23:59:58"))   # 86398
+        clock.advance(parse_clock("00:00:03"))   # 86403
+    """
+
+    def __init__(self):
+        self.day = 0
+        # самое позднее время сессии, виденное до сих пор
+        self.latest = 0
+
+    def advance(self, seconds: int) -> int:
+        """Время суток следующей строки → время сессии (небольшой откат назад — те же сутки)"""
+        if seconds + MIDNIGHT_JUMP < self.latest % DAY_SECONDS:
+            self.day += 1
+        value = self.day * DAY_SECONDS + seconds
+        self.latest = max(self.latest, value)
+        return value
+
+
+# ─────────────────────────────────────────────
+# 🔤 Таблица интернированных строк
+# ─────────────────────────────────────────────
+class StringTable:
+    """Хранит каждую строку один раз; id = индекс в списке, None → -1"""
+
+    __slots__ = ("strings", "_ids")
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, s: Optional[str]) -> int:
+        if s is None:
+            return -1
+        i = self._ids.get(s)
+        if i is None:
+            i = len(self.strings)
+            self._ids[s] = i
+            self.strings.append(s)
+        return i
+
+    def lookup(self, s: Optional[str]) -> int:
+        """id строки без добавления (-1, если её нет)"""
+        if s is None:
+            return -1
+        return self._ids.get(s, -1)
+
+    def get(self, i: int) -> Optional[str]:
+        return self.strings[i] if i >= 0 else None
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+# ─────────────────────────────────────────────
+# 🗄️ Колоночное хранилище ошибок
+# ─────────────────────────────────────────────
+class ErrorStore:
+    """
+    Компактное хранилище ParsedError.
+
+    Строковые поля лежат в интернированных таблицах (в колонке — только id),
+    номера строк — в массивах array('q'). Миллион ошибок — это несколько
+    массивов целых чисел, а не миллион объектов с __dict__ и копиями путей.
+    Каждый ParsedError, полученный из хранилища, — лишь «окно» на одну строку.
+    """
+
+    # Поля, которые интернируются в таблицы строк (порядок intern_fields)
+    STR_FIELDS = ("category", "type", "file", "key", "element", "message")
+    # Порядок полей ParsedError (как в прежнем dataclass + префикс строки лога)
+    FIELDS = (
+        "category", "type", "file", "line", "key", "element", "message", "log_line",
+        "time", "source", "count", "last_log_line", "log",
+    )
+
+    def __init__(self, sample_size: int = 0):
+        # log — из какого лога сессии строка (None — единственный разобранный лог)
+        interned = self.STR_FIELDS + ("source", "log")
+        self.tables: Dict[str, StringTable] = {f: StringTable() for f in interned}
+        self.columns: Dict[str, array] = {f: array("i") for f in interned}
+        # line: -1 → None; неканоничные значения ("007") хранятся отдельно
+        self.lines = array("q")
+        self._line_text: Dict[int, str] = {}
+        # log_line: 0 → None (строки лога нумеруются с 1)
+        self.log_lines = array("q")
+        # time: секунды от 00:00:00 из префикса «[hh:mm:ss]», -1 → None
+        self.times = array("i")
+        # Повторы: отпечаток (кортеж id из intern_fields) → строка; у строки —
+        # число вхождений, последний log_line и до sample_size первых позиций
+        self.fingerprints: Dict[tuple, int] = {}
+        self.counts_col = array("I")
+        self.last_log_lines = array("q")
+        self.sample_size = sample_size
+        self.samples: Dict[int, array] = {}
+        self._reset_time_index()
+        self._reset_source_index()
+
+    # ─────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self.log_lines)
+
+    def __getitem__(self, row: int) -> "ParsedError":
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return ParsedError._view(self, row)
+
+    def __iter__(self) -> Iterator["ParsedError"]:
+        view = ParsedError._view
+        for row in range(len(self)):
+            yield view(self, row)
+
+    # ─────────────────────────────────────────
+    def intern_fields(self, fields: tuple) -> tuple:
+        """
+        (category, type, file, line, key, element, message) →
+        кортеж id строк (line остаётся строкой). Это и есть отпечаток ошибки
+        для подсчёта повторов.
+        """
+        t = self.tables
+        return (
+            t["category"].intern(fields[0]),
+            t["type"].intern(fields[1]),
+            t["file"].intern(fields[2]),
+            fields[3],
+            t["key"].intern(fields[4]),
+            t["element"].intern(fields[5]),
+            t["message"].intern(fields[6]),
+        )
+
+    def append_ids(
+        self,
+        ids: tuple,
+        log_line: Optional[int] = None,
+        time: Optional[int] = None,
+        source: Optional[str] = None,
+        log: Optional[str] = None,
+    ) -> int:
+        """Добавляет строку из результата intern_fields; возвращает её номер"""
+        row = len(self.log_lines)
+        c = self.columns
+        c["category"].append(ids[0])
+        c["type"].append(ids[1])
+        c["file"].append(ids[2])
+        self._append_line(row, ids[3])
+        c["key"].append(ids[4])
+        c["element"].append(ids[5])
+        c["message"].append(ids[6])
+        c["source"].append(self.tables["source"].intern(source))
+        c["log"].append(self.tables["log"].intern(log))
+        self.log_lines.append(log_line or 0)
+        self.times.append(-1 if time is None else time)
+        self.counts_col.append(1)
+        self.last_log_lines.append(log_line or 0)
+        return row
+
+    def add_occurrence(
+        self,
+        ids: tuple,
+        log_line: Optional[int] = None,
+        time: Optional[int] = None,
+        source: Optional[str] = None,
+        count: int = 1,
+        last_log_line: Optional[int] = None,
+        sample: Iterable[int] = (),
+        log: Optional[str] = None,
+    ) -> Tuple[int, bool]:
+        """
+        Учитывает вхождение(я) ошибки с отпечатком ids.
+
+        Первое вхождение создаёт строку (её log_line, time и source — от
+        первого раза), повторные лишь увеличивают count и last_log_line.
+        count/last_log_line/sample позволяют слить уже посчитанные группы
+        (результаты воркеров, идущие по порядку лога).
+        Одинаковые ошибки из разных логов (log) считаются раздельно.
+        Возвращает (номер строки, создана ли она сейчас).
+        """
+        last = last_log_line or log_line
+        positions = list(sample) if sample else ([log_line] if log_line else [])
+        if log is not None:
+            ids = ids + (self.tables["log"].intern(log),)
+        row = self.fingerprints.get(ids)
+        if row is None:
+            row = self.append_ids(ids, log_line, time, source, log)
+            self.fingerprints[ids] = row
+            self.counts_col[row] = count
+            self.last_log_lines[row] = last or 0
+            new = True
+        else:
+            self.counts_col[row] += count
+            if last and last > self.last_log_lines[row]:
+                self.last_log_lines[row] = last
+            new = False
+        if self.sample_size and positions:
+            kept = self.samples.get(row)
+            if kept is None:
+                kept = self.samples[row] = array("q")
+            room = self.sample_size - len(kept)
+            if room > 0:
+                kept.extend(positions[:room])
+        return row, new
+
+    def fingerprint(self, row: int) -> tuple:
+        """
+        Отпечаток строки (тот же кортеж, что даёт intern_fields; у строк с
+        заданным log к нему добавлен id лога)
+        """
+        c = self.columns
+        ids = (
+            c["category"][row], c["type"][row], c["file"][row], self.get(row, "line"),
+            c["key"][row], c["element"][row], c["message"][row],
+        )
+        log_id = c["log"][row]
+        return ids if log_id < 0 else ids + (log_id,)
+
+    def top(self, n: int = 10) -> List[int]:
+        """Номера строк самых частых ошибок"""
+        return sorted(range(len(self)), key=lambda r: -self.counts_col[r])[:n]
+
+    def total_occurrences(self) -> int:
+        return sum(self.counts_col)
+
+    # ─────────────────────────────────────────
+    def to_state(self) -> Dict[str, Any]:
+        """Снимок хранилища для JSON (таблицы строк и колонки как списки)"""
+        return {
+            "sample_size": self.sample_size,
+            "tables": {f: t.strings for f, t in self.tables.items()},
+            "columns": {f: col.tolist() for f, col in self.columns.items()},
+            "lines": self.lines.tolist(),
+            "line_text": {str(r): s for r, s in self._line_text.items()},
+            "log_lines": self.log_lines.tolist(),
+            "times": self.times.tolist(),
+            "counts": self.counts_col.tolist(),
+            "last_log_lines": self.last_log_lines.tolist(),
+            "samples": {str(r): a.tolist() for r, a in self.samples.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ErrorStore":
+        """Восстанавливает хранилище из to_state() (вместе с отпечатками)"""
+        store = cls(sample_size=state.get("sample_size", 0))
+        for f, strings in state["tables"].items():
+            table = store.tables[f]
+            for s in strings:
+                table.intern(s)
+        for f, values in state["columns"].items():
+            store.columns[f] = array("i", values)
+        store.lines = array("q", state["lines"])
+        # снимки до появления колонки log: все строки — из одного лога
+        for f, col in store.columns.items():
+            if not col and store.lines:
+                store.columns[f] = array("i", [-1]) * len(store.lines)
+        store._line_text = {int(r): s for r, s in state["line_text"].items()}
+        store.log_lines = array("q", state["log_lines"])
+        store.times = array("i", state["times"])
+        store.counts_col = array("I", state["counts"])
+        store.last_log_lines = array("q", state["last_log_lines"])
+        store.samples = {int(r): array("q", a) for r, a in state["samples"].items()}
+        store.rebuild_fingerprints()
+        return store
+
+    def rebuild_fingerprints(self):
+        """Заново строит отпечаток → строка (первая строка с таким отпечатком)"""
+        self.fingerprints = {}
+        for row in range(len(self)):
+            self.fingerprints.setdefault(self.fingerprint(row), row)
+
+    def append(
+        self,
+        category: str,
+        type: str,
+        file: Optional[str] = None,
+        line: Optional[str] = None,
+        key: Optional[str] = None,
+        element: Optional[str] = None,
+        message: Optional[str] = None,
+        log_line: Optional[int] = None,
+        time: Optional[int] = None,
+        source: Optional[str] = None,
+        log: Optional[str] = None,
+    ) -> int:
+        """Добавляет ошибку по значениям полей; возвращает номер строки"""
+        ids = self.intern_fields((category, type, file, line, key, element, message))
+        return self.append_ids(ids, log_line, time, source, log)
+
+    def _append_line(self, row: int, line: Optional[str]):
+        if line is None:
+            self.lines.append(-1)
+            return
+        s = str(line)
+        if s.isdigit() and str(int(s)) == s:
+            self.lines.append(int(s))
+        else:
+            self.lines.append(-1)
+            self._line_text[row] = s
+
+    # ─────────────────────────────────────────
+    def get(self, row: int, field: str) -> Any:
+        """Значение одного поля строки row"""
+        if field == "log_line":
+            return self.log_lines[row] or None
+        if field == "time":
+            t = self.times[row]
+            return t if t >= 0 else None
+        if field == "count":
+            return self.counts_col[row]
+        if field == "last_log_line":
+            return self.last_log_lines[row] or None
+        if field == "line":
+            n = self.lines[row]
+            return str(n) if n >= 0 else self._line_text.get(row)
+        return self.tables[field].get(self.columns[field][row])
+
+    def set(self, row: int, field: str, value: Any):
+        """Меняет одно поле строки row"""
+        if field == "log_line":
+            self.log_lines[row] = value or 0
+        elif field == "time":
+            self.times[row] = -1 if value is None else value
+            self._reset_time_index()
+        elif field == "count":
+            self.counts_col[row] = value or 1
+        elif field == "last_log_line":
+            self.last_log_lines[row] = value or 0
+        elif field == "line":
+            self._line_text.pop(row, None)
+            if value is None:
+                self.lines[row] = -1
+            else:
+                s = str(value)
+                if s.isdigit() and str(int(s)) == s:
+                    self.lines[row] = int(s)
+                else:
+                    self.lines[row] = -1
+                    self._line_text[row] = s
+        else:
+            self.columns[field][row] = self.tables[field].intern(value)
+            if field == "source":
+                self._reset_source_index()
+
+    def astuple(self, row: int) -> tuple:
+        return tuple(self.get(row, f) for f in self.FIELDS)
+
+    def to_dict(self, row: int) -> Dict[str, Any]:
+        d = {f: self.get(row, f) for f in self.FIELDS}
+        if row in self.samples:
+            d["sample"] = list(self.samples[row])
+        return d
+
+    # ─────────────────────────────────────────
+    # 🕒 Индекс по времени и источнику
+    # ─────────────────────────────────────────
+    def _reset_time_index(self):
+        # ключ — время сессии (SessionClock по строкам в порядке лога), а не
+        # время суток: после полуночи «12:01» следующего дня — другой ключ
+        self._time_keys = array("q")
+        self._time_rows = array("i")
+        self._time_clock = SessionClock()
+        self._time_synced = 0
+        self._time_dirty = False
+
+    def _sync_time_index(self):
+        """
+        Дописывает в индекс новые строки. Пока время не убывает (обычный
+        лог), индекс просто растёт отсортированным; иначе один раз
+        пересортировывается при следующем запросе.
+        """
+        n = len(self)
+        keys, rows = self._time_keys, self._time_rows
+        for row in range(self._time_synced, n):
+            t = self.times[row]
+            if t < 0:
+                continue
+            t = self._time_clock.advance(t)
+            if keys and t < keys[-1]:
+                self._time_dirty = True
+            keys.append(t)
+            rows.append(row)
+        self._time_synced = n
+        if self._time_dirty:
+            pairs = sorted(zip(keys, rows))
+            self._time_keys = array("q", (k for k, _ in pairs))
+            self._time_rows = array("i", (r for _, r in pairs))
+            self._time_dirty = False
+
+    def rows_between(self, start: int, end: int) -> List[int]:
+        """
+        Номера строк с временем сессии в [start, end], в порядке лога.
+        Время сессии — секунды от полуночи первого дня (SessionClock):
+        parse_clock("12:01") — первые сутки, + DAY_SECONDS — вторые.
+        start > end — интервал через полночь: end относится к следующим
+        суткам.
+        """
+        if start > end:
+            end += DAY_SECONDS
+        self._sync_time_index()
+        lo = bisect_left(self._time_keys, start)
+        hi = bisect_right(self._time_keys, end)
+        return sorted(self._time_rows[lo:hi])
+
+    def errors_between(self, start: int, end: int) -> List["ParsedError"]:
+        """Ошибки из интервала времени (см. rows_between)"""
+        return [ParsedError._view(self, r) for r in self.rows_between(start, end)]
+
+    def _reset_source_index(self):
+        self._source_rows: Dict[int, array] = {}
+        self._source_synced = 0
+
+    def rows_from_source(self, source: str) -> List[int]:
+        """Номера строк, пришедших из файла движка (например jomini_script_system.cpp)"""
+        col = self.columns["source"]
+        index = self._source_rows
+        for row in range(self._source_synced, len(col)):
+            sid = col[row]
+            if sid >= 0:
+                index.setdefault(sid, array("i")).append(row)
+        self._source_synced = len(col)
+        sid = self.tables["source"].lookup(source)
+        return list(index.get(sid, ()))
+
+    def errors_from_source(self, source: str) -> List["ParsedError"]:
+        return [ParsedError._view(self, r) for r in self.rows_from_source(source)]
+
+    # ─────────────────────────────────────────
+    def rows_by_category(self) -> Dict[str, List[int]]:
+        """Категория → номера строк (по колонке id, без создания объектов)"""
+        by_id: DefaultDict[int, List[int]] = defaultdict(list)
+        for row, cid in enumerate(self.columns["category"]):
+            by_id[cid].append(row)
+        names = self.tables["category"]
+        return {names.get(cid): rows for cid, rows in by_id.items()}
+
+    def group_by_category(self) -> DefaultDict[str, List["ParsedError"]]:
+        """Категория → ParsedError (окна на строки хранилища)"""
+        grouped: DefaultDict[str, List[ParsedError]] = defaultdict(list)
+        view = ParsedError._view
+        for cat, rows in self.rows_by_category().items():
+            grouped[cat] = [view(self, r) for r in rows]
+        return grouped
+
+    def counts(self, field: str, occurrences: bool = False) -> Dict[str, int]:
+        """
+        Число строк по значениям строкового поля (например, category).
+        occurrences=True — сумма вхождений (count) вместо числа строк.
+        """
+        per_id: Dict[int, int] = {}
+        weights = self.counts_col if occurrences else None
+        for row, i in enumerate(self.columns[field]):
+            per_id[i] = per_id.get(i, 0) + (weights[row] if weights is not None else 1)
+        table = self.tables[field]
+        return {table.get(i): n for i, n in per_id.items()}
+
+
+# ─────────────────────────────────────────────
+# 📘 ParsedError — окно на строку ErrorStore
+# ─────────────────────────────────────────────
+def _field_property(name: str):
+    def fget(self):
+        if self._store is None:
+            return self._row[_FIELD_INDEX[name]]
+        return self._store.get(self._row, name)
+
+    def fset(self, value):
+        if self._store is None:
+            self._row[_FIELD_INDEX[name]] = value
+        else:
+            self._store.set(self._row, name, value)
+
+    return property(fget, fset)
+
+
+_FIELD_INDEX = {f: i for i, f in enumerate(ErrorStore.FIELDS)}
+
+
+class ParsedError:
+    """
+    Нормализованная структура ошибки из CK3‑лога.
+
+    Обычно это окно на строку ErrorStore (_store, _row): сам объект хранит
+    только две ссылки. Созданный напрямую ParsedError(...) «отсоединён» —
+    держит значения у себя в списке.
+
+    time — секунды из префикса «[hh:mm:ss]», source — файл движка из
+    «[jomini_script_system.cpp:123]» (без номера строки). count — сколько раз
+    ошибка встретилась в логе, log_line / last_log_line — первое и последнее
+    вхождение. log — имя лога сессии (game.log, debug.log…), если разбиралось
+    несколько логов сразу.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    category = _field_property("category")
+    type = _field_property("type")
+    file = _field_property("file")
+    line = _field_property("line")
+    key = _field_property("key")
+    element = _field_property("element")
+    message = _field_property("message")
+    log_line = _field_property("log_line")
+    time = _field_property("time")
+    source = _field_property("source")
+    count = _field_property("count")
+    last_log_line = _field_property("last_log_line")
+    log = _field_property("log")
+
+    def __init__(
+        self,
+        category: str,
+        type: str,
+        file: Optional[str] = None,
+        line: Optional[str] = None,
+        key: Optional[str] = None,
+        element: Optional[str] = None,
+        message: Optional[str] = None,
+        log_line: Optional[int] = None,
+        time: Optional[int] = None,
+        source: Optional[str] = None,
+        count: int = 1,
+        last_log_line: Optional[int] = None,
+        log: Optional[str] = None,
+    ):
+        self._store = None
+        self._row = [
+            category, type, file, line, key, element, message, log_line,
+            time, source, count, last_log_line if last_log_line is not None else log_line, log,
+        ]
+
+    @classmethod
+    def _view(cls, store: ErrorStore, row: int) -> "ParsedError":
+        obj = cls.__new__(cls)
+        obj._store = store
+        obj._row = row
+        return obj
+
+    @property
+    def row(self) -> Optional[int]:
+        """Номер строки в ErrorStore (None для отсоединённой ошибки)"""
+        return self._row if self._store is not None else None
+
+    # ─────────────────────────────────────────
+    def astuple(self) -> Tuple:
+        if self._store is None:
+            return tuple(self._row)
+        return self._store.astuple(self._row)
+
+    @property
+    def sample(self) -> List[int]:
+        """Сохранённые позиции вхождений (не больше ErrorStore.sample_size)"""
+        if self._store is None:
+            return [self.log_line] if self.log_line else []
+        return list(self._store.samples.get(self._row, ()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self._store is not None:
+            return self._store.to_dict(self._row)
+        return dict(zip(ErrorStore.FIELDS, self.astuple()))
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def __eq__(self, other):
+        if not isinstance(other, ParsedError):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash(self.astuple())
+
+    def __repr__(self):
+        fields = ", ".join(f"{f}={v!r}" for f, v in zip(ErrorStore.FIELDS, self.astuple()))
+        return f"ParsedError({fields})"
@@ -0,0 +1,245 @@
+import os
+import json
+import threading
+from pathlib import Path
+from typing import Optional, Any, Callable, Dict, Iterable, List, NamedTuple, Tuple, Union
+
+from paradox_script import empty_descriptor, parse_descriptor
+from text_encoding import read_text
+from workshop_index import INDEX_SUFFIXES, FileLookup
+
+
+# ─────────────────────────────────────────────
+# 📄 descriptor.mod / *.mod
+# ─────────────────────────────────────────────
+# Меняется вместе с форматом кэша дескрипторов (или набором полей)
+DESCRIPTOR_CACHE_VERSION = 1
+
+
+def read_descriptor(path: Union[str, os.PathLike]) -> Dict[str, Any]:
+    """
+    Поля дескриптора мода (см. parse_descriptor): name, version, tags,
+    dependencies, replace_path, remote_file_id… Нет файла — пустые значения.
+    """
+    try:
+        text, _enc = read_text(path)
+    except OSError:
+        return empty_descriptor()
+    return parse_descriptor(text)
+
+
+class DescriptorCache:
+    """
+    Разобранные дескрипторы между запусками — в JSON, по ключу
+    (абсолютный путь, mtime, размер).
+
+        descriptors = DescriptorCache("cache/descriptors.json")
+        info = descriptors.read(mod_dir / "descriptor.mod")
+        descriptors.save()
+
+    Неизменившийся дескриптор стоит один stat. read() можно звать из
+    разных потоков (скан и проверка конфликтов); возвращаемый словарь
+    общий — не изменять.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        # абсолютный путь → [mtime_ns, размер, поля]
+        self._entries: Dict[str, list] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == DESCRIPTOR_CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def read(self, path: Union[str, os.PathLike]) -> Dict[str, Any]:
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return empty_descriptor()
+        stamp = [st.st_mtime_ns, st.st_size]
+        known = self._entries.get(key)
+        if known and known[:2] == stamp:
+            return known[2]
+        info = read_descriptor(key)
+        with self._lock:
+            self._entries[key] = stamp + [info]
+            self._dirty = True
+        return info
+
+    def save(self):
+        """Записывает кэш, если что‑то перечитывалось"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": DESCRIPTOR_CACHE_VERSION, "entries": dict(self._entries)}
+            self._dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[DescriptorCache] Не удалось сохранить кэш: {e}")
+
+
+# ─────────────────────────────────────────────
+# 📜 Порядок загрузки плейсета
+# ─────────────────────────────────────────────
+# Лаунчер записывает сюда включённые моды активного плейсета — по порядку
+DLC_LOAD_FILE = "dlc_load.json"
+
+
+def find_game_dir(candidates: Iterable[Union[str, os.PathLike]]) -> Optional[Path]:
+    """Первая папка с dlc_load.json (Documents/Paradox Interactive/Crusader Kings III)"""
+    for c in candidates:
+        c = Path(c)
+        if (c / DLC_LOAD_FILE).is_file():
+            return c
+    return None
+
+
+def read_load_order(
+    game_dir: Union[str, os.PathLike],
+    mod_ids: Iterable[str],
+    read: Callable[[Path], Dict[str, Any]] = read_descriptor,
+) -> List[str]:
+    """
+    Моды Workshop (mod_id — имя папки) в порядке загрузки: первый
+    загружается первым, последний перекрывает остальных.
+
+    dlc_load.json ссылается на «mod/ugc_<id>.mod»; папка мода берётся из
+    его path, remote_file_id или имени файла (read — чем читать .mod,
+    например DescriptorCache.read). Моды не из плейсета в список не попадают.
+    """
+    game_dir = Path(game_dir)
+    known = set(mod_ids)
+    try:
+        with open(game_dir / DLC_LOAD_FILE, "r", encoding="utf-8-sig") as f:
+            enabled = json.load(f).get("enabled_mods", [])
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"[LoadOrder] Не удалось прочитать {DLC_LOAD_FILE}: {e}")
+        return []
+    order: List[str] = []
+    for ref in enabled:
+        desc = read(game_dir / ref)
+        stem = Path(ref).stem
+        candidates = [
+            os.path.basename((desc["path"] or "").replace("\\", "/").rstrip("/")),
+            desc["remote_file_id"],
+            stem[4:] if stem.startswith("ugc_") else stem,
+        ]
+        mod_id = next((c for c in candidates if c in known), None)
+        if mod_id and mod_id not in order:
+            order.append(mod_id)
+    return order
+
+
+# ─────────────────────────────────────────────
+# 🏆 Какой мод на самом деле даёт файл
+# ─────────────────────────────────────────────
+class Resolution(NamedTuple):
+    """
+    winner — (mod_id, путь) файла, который загрузит игра (None, если все
+    копии выброшены replace_path более позднего мода); shadowed — остальные
+    копии по порядку загрузки.
+    """
+    winner: Optional[Tuple[str, str]]
+    shadowed: List[Tuple[str, str]]
+
+    @property
+    def owner(self) -> Tuple[str, str]:
+        """Кому приписывать ошибку: победитель, иначе последняя копия"""
+        return self.winner or self.shadowed[-1]
+
+
+class FileResolver:
+    """
+    Разрешение относительного пути в файл мода с учётом порядка загрузки
+    и replace_path. Строится один раз за скан; ответы запоминаются.
+
+        resolver = FileResolver(lookup, mod_roots, load_order, replace_paths)
+        res = resolver.resolve("common/traits/00_traits.txt")
+        res.winner, res.shadowed
+
+    Позже загруженный мод перекрывает файл с тем же путём; replace_path
+    мода выбрасывает всё из этой папки у модов, загруженных раньше.
+    Моды не из плейсета считаются загруженными раньше всех и побеждают,
+    только если файла больше ни у кого нет; между собой — первый по
+    индексу (как прежний перебор, когда порядок загрузки неизвестен).
+
+    Индексированные файлы (INDEX_SUFFIXES) ищутся в FileLookup без обращения
+    к диску; прочие (gfx, mesh…) проверяются stat'ом — один раз на путь.
+    """
+
+    def __init__(
+        self,
+        lookup: FileLookup,
+        mod_roots: Dict[str, str],
+        load_order: Iterable[str] = (),
+        replace_paths: Optional[Dict[str, Iterable[str]]] = None,
+        indexed_suffixes: Tuple[str, ...] = INDEX_SUFFIXES,
+    ):
+        self.lookup = lookup
+        self.mod_roots = mod_roots
+        self.load_order = list(load_order)
+        # ранг: больше — загружается позже; моды не из плейсета — отрицательные
+        self.rank: Dict[str, int] = {m: i for i, m in enumerate(self.load_order)}
+        outside = [m for m in mod_roots if m not in self.rank]
+        for i, m in enumerate(outside):
+            self.rank[m] = -1 - i
+        # папка replace_path → самый поздний ранг мода, который её заменяет
+        self.replaced_before: Dict[str, int] = {}
+        for mod_id, paths in (replace_paths or {}).items():
+            r = self.rank.get(mod_id, -1)
+            if r < 0:
+                continue
+            for p in paths:
+                folder = p.replace("\\", "/").strip("/").lower()
+                if folder and r > self.replaced_before.get(folder, -1):
+                    self.replaced_before[folder] = r
+        self.indexed_suffixes = indexed_suffixes
+        self._cache: Dict[str, Optional[Resolution]] = {}
+
+    # ─────────────────────────────────────────
+    def _providers(self, key: str) -> List[Tuple[str, str]]:
+        """(mod_id, путь) всех модов с файлом key"""
+        if key.endswith(self.indexed_suffixes):
+            return [(mod_id, path) for _, mod_id, _, path in self.lookup.exact(key)]
+        rel = key.replace("/", os.sep)
+        found = []
+        for mod_id, root in self.mod_roots.items():
+            path = os.path.join(root, rel)
+            if os.path.isfile(path):
+                found.append((mod_id, path))
+        return found
+
+    def _replaced_rank(self, key: str) -> int:
+        """Самый поздний мод, чей replace_path накрывает key (-1 — нет такого)"""
+        best = -1
+        folder = key
+        while "/" in folder:
+            folder = folder.rpartition("/")[0]
+            best = max(best, self.replaced_before.get(folder, -1))
+        return best
+
+    def resolve(self, key: str) -> Optional[Resolution]:
+        """Разрешение ключа относительного пути (None — файла нет ни в одном моде)"""
+        key = key.replace("\\", "/").strip("/").lower()
+        if key in self._cache:
+            return self._cache[key]
+        providers = sorted(self._providers(key), key=lambda p: self.rank[p[0]])
+        res = None
+        if providers:
+            cut = self._replaced_rank(key)
+            alive = providers if cut < 0 else [p for p in providers if self.rank[p[0]] >= cut]
+            winner = alive[-1] if alive else None
+            res = Resolution(winner, [p for p in providers if p is not winner])
+        self._cache[key] = res
+        return res
@@ -0,0 +1,249 @@
+import os
+import re
+import queue
+import sqlite3
+from pathlib import Path
+from typing import Optional, Dict, Iterator, List, NamedTuple, TextIO, Tuple, Union
+
+from load_order import FileResolver
+from workshop_index import IndexedFile
+
+
+# ─────────────────────────────────────────────
+# 🌐 Индекс ключей локализации
+# ─────────────────────────────────────────────
+# Меняется вместе со схемой базы (или правилами разбора)
+LOC_INDEX_VERSION = 1
+# Какие файлы модов разбираются
+LOC_PREFIX = "localization/"
+LOC_SUFFIX = ".yml"
+# Типы ошибок, которые ссылаются на ключ локализации (поле key)
+LOC_ERROR_TYPES = frozenset((
+    "MISSING_LOC_ENTRY",
+    "MISSING_FAITH_LOC",
+    "LOC_DATA_ERROR",
+    "MISSING_GAME_CONCEPT",
+    "UNRECOGNIZED_LOC_KEY",
+    "UNRECOGNIZED_LOC_KEY_NEAR",
+    "UNRECOGNIZED_LOC_KEY_FILE_CAT",
+    "UNRECOGNIZED_LOC_KEY_SIMPLE",
+))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, mod_id TEXT NOT NULL,
+    rel TEXT NOT NULL, language TEXT, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keys (key TEXT NOT NULL, file_id INTEGER NOT NULL, line INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS keys_by_key ON keys (key);
+CREATE INDEX IF NOT EXISTS keys_by_file ON keys (file_id);
+"""
+
+# « l_english:» — заголовок языка; « key:0 "текст"» / « key: "текст"» — запись
+_LANGUAGE = re.compile(r"\s*(l_\w+)\s*:\s*(?:#.*)?$")
+_ENTRY = re.compile(r"\s*([\w.\-']+):\d*\s*\"")
+_LANGUAGE_IN_NAME = re.compile(r"_(l_[a-z_]+)\.yml$", re.IGNORECASE)
+
+
+class LocEntry(NamedTuple):
+    """
+    Где объявлен ключ: мод, файл (путь в моде через «/», как на диске),
+    строка, язык; key — найденный ключ (для родственного — он, а не искомый)
+    """
+    mod_id: str
+    file: str
+    line: int
+    language: Optional[str]
+    key: str
+
+
+def iter_loc_entries(
+    f: TextIO, path: Union[str, os.PathLike]
+) -> Tuple[Optional[str], Iterator[Tuple[str, int]]]:
+    """
+    Потоковый построчный разбор .yml локализации из открытого файла f
+    (utf-8-sig): (язык, итератор (ключ, номер строки)). Язык — из
+    заголовка «l_<язык>:»; нет заголовка — из имени файла path
+    (*_l_english.yml). Файл в память целиком не читается, закрывает его
+    вызывающий.
+    """
+    first = []
+    language = None
+    read = 0
+    # заголовок — первая непустая строка без комментария
+    for read, line in enumerate(f, 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        m = _LANGUAGE.match(line)
+        if m:
+            language = m.group(1).lower()
+        else:
+            first.append((read, line))
+        break
+    if language is None:
+        m = _LANGUAGE_IN_NAME.search(os.fspath(path))
+        language = m.group(1).lower() if m else None
+
+    def entries() -> Iterator[Tuple[str, int]]:
+        for n, line in first:
+            m = _ENTRY.match(line)
+            if m:
+                yield m.group(1), n
+        for n, line in enumerate(f, read + 1):
+            m = _ENTRY.match(line)
+            if m:
+                yield m.group(1), n
+
+    return language, entries()
+
+
+class LocIndex:
+    """
+    Ключ локализации → где он объявлен во всех модах, в SQLite между
+    запусками.
+
+        loc = LocIndex("cache/loc_index.sqlite")
+        loc.update(snapshot.files)            # только изменившиеся .yml
+        loc.find("trait_brave")               # [LocEntry…]
+        loc.owner("trait_brave_desc", resolver)
+        loc.close()
+
+    Файл перечитывается, только если изменились его размер или mtime
+    (свежий stat, а не снимок индекса); удалённые файлы выбрасываются.
+    Соединение открывает update() и использует тот же поток, что и поиск.
+    """
+
+    def __init__(self, db_path: Union[str, os.PathLike]):
+        self.db_path = os.fspath(db_path)
+        self.reused = 0
+        self.parsed = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._found: Dict[str, List[LocEntry]] = {}
+
+    # ─────────────────────────────────────────
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != str(LOC_INDEX_VERSION):
+            conn.executescript("DROP TABLE files; DROP TABLE keys;")
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(LOC_INDEX_VERSION),))
+        return conn
+
+    def update(
+        self,
+        files: Dict[str, Dict[str, IndexedFile]],
+        progress: Optional[queue.Queue] = None,
+    ):
+        """Приводит индекс к файлам localization/**.yml из files (WorkshopSnapshot.files)"""
+        self.close()
+        self.reused = self.parsed = 0
+        try:
+            conn = self._conn = self._connect()
+        except sqlite3.Error as e:
+            print(f"[LocIndex] База индекса недоступна: {e}")
+            return
+        known = {path: (file_id, size, mtime_ns) for file_id, path, size, mtime_ns
+                 in conn.execute("SELECT id, path, size, mtime_ns FROM files")}
+
+        todo = []
+        seen = set()
+        for mod_id, mod_files in files.items():
+            for key, f in mod_files.items():
+                if not (key.startswith(LOC_PREFIX) and key.endswith(LOC_SUFFIX)):
+                    continue
+                path = os.path.abspath(f.path)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                old = known.get(path)
+                if old and old[1:] == (st.st_size, st.st_mtime_ns):
+                    self.reused += 1
+                else:
+                    # столько же последних компонентов пути, сколько в ключе
+                    # (длина строки после lower() может измениться, число частей — нет)
+                    rel = "/".join(Path(f.path).parts[-(key.count("/") + 1):])
+                    todo.append((mod_id, rel, path, st.st_size, st.st_mtime_ns))
+
+        gone = [(known[p][0],) for p in known if p not in seen]
+        with conn:
+            conn.executemany("DELETE FROM keys WHERE file_id = ?", gone)
+            conn.executemany("DELETE FROM files WHERE id = ?", gone)
+            for i, (mod_id, rel, path, size, mtime_ns) in enumerate(todo, 1):
+                if path in known:
+                    conn.execute("DELETE FROM keys WHERE file_id = ?", (known[path][0],))
+                    conn.execute("DELETE FROM files WHERE id = ?", (known[path][0],))
+                try:
+                    with open(path, "r", encoding="utf-8-sig", errors="replace") as fh:
+                        language, entries = iter_loc_entries(fh, path)
+                        cur = conn.execute(
+                            "INSERT INTO files (path, mod_id, rel, language, size, mtime_ns) VALUES (?, ?, ?, ?, ?, ?)",
+                            (path, mod_id, rel, language, size, mtime_ns))
+                        file_id = cur.lastrowid
+                        conn.executemany("INSERT INTO keys VALUES (?, ?, ?)",
+                                         ((k, file_id, n) for k, n in entries))
+                except OSError as e:
+                    print(f"[LocIndex] {path}: {e}")
+                if progress is not None and (i % 200 == 0 or i == len(todo)):
+                    progress.put(("loc", i, len(todo)))
+        self.parsed = len(todo)
+
+    def find(self, key: str) -> List[LocEntry]:
+        """Все объявления ключа (с учётом регистра, как в игре)"""
+        if key in self._found:
+            return self._found[key]
+        found: List[LocEntry] = []
+        if self._conn is not None:
+            found = [LocEntry(*row) for row in self._conn.execute(
+                "SELECT f.mod_id, f.rel, k.line, f.language, k.key FROM keys k"
+                " JOIN files f ON f.id = k.file_id WHERE k.key = ? ORDER BY f.id, k.line", (key,))]
+        self._found[key] = found
+        return found
+
+    def owner(
+        self, key: str, resolver: Optional[FileResolver] = None
+    ) -> Tuple[Optional[LocEntry], bool]:
+        """
+        Чья это локализация: (объявление, точно ли совпал ключ).
+
+        Ключ объявлен — берётся объявление из файла, который игра
+        действительно загрузит, затем из localization/**/replace/, затем из
+        мода, загружаемого последним. Не объявлен нигде — ищется мод,
+        который объявляет «родственный» ключ: trait_x_desc → trait_x,
+        a.b.c → a.b (такой мод и должен был объявить недостающий); одно
+        слово без «_» и «.» слишком общее и родственным не считается.
+        """
+        entries = self.find(key)
+        exact = True
+        if not entries:
+            exact = False
+            stem = key
+            while not entries:
+                cut = max(stem.rfind("_"), stem.rfind("."))
+                stem = stem[:cut]
+                if cut <= 0 or ("_" not in stem and "." not in stem):
+                    return None, False
+                entries = self.find(stem)
+
+        def rank(e: LocEntry):
+            live = 1
+            if resolver is not None:
+                res = resolver.resolve(e.file)
+                live = int(res is not None and res.winner is not None and res.winner[0] == e.mod_id)
+            order = resolver.rank.get(e.mod_id, -1) if resolver is not None else 0
+            return live, "/replace/" in e.file, order
+
+        return max(entries, key=rank), exact
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._found = {}
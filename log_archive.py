@@ -0,0 +1,71 @@
+import os
+import bz2
+import gzip
+import lzma
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional, Union
+
+
+# ─────────────────────────────────────────────
+# 📦 Архивированные логи
+# ─────────────────────────────────────────────
+# Сжатые одиночные файлы: суффикс → функция открытия (двоичный режим)
+COMPRESSED_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+    ".lzma": lzma.open,
+}
+ZIP_SUFFIX = ".zip"
+# Какой файл брать из zip, если их там несколько
+LOG_MEMBER_NAME = "error.log"
+
+
+def is_archive(path: Union[str, os.PathLike]) -> bool:
+    """Лог сжат (gz/bz2/xz) или лежит в zip"""
+    suffix = os.path.splitext(os.fspath(path))[1].lower()
+    return suffix in COMPRESSED_OPENERS or suffix == ZIP_SUFFIX
+
+
+def zip_log_member(zf: zipfile.ZipFile) -> Optional[str]:
+    """Имя лога внутри zip: error.log (в любой папке), иначе первый *.log"""
+    logs = [n for n in zf.namelist() if n.lower().endswith(".log") and not n.endswith("/")]
+    for name in logs:
+        if os.path.basename(name).lower() == LOG_MEMBER_NAME:
+            return name
+    return logs[0] if logs else None
+
+
+def archive_member(path: Union[str, os.PathLike]) -> Optional[str]:
+    """Подпись для журнала: «archive.zip → logs/error.log» (None — не zip)"""
+    if not os.fspath(path).lower().endswith(ZIP_SUFFIX):
+        return None
+    with zipfile.ZipFile(path) as zf:
+        return zip_log_member(zf)
+
+
+@contextmanager
+def open_log_stream(path: Union[str, os.PathLike]) -> Iterator[IO[bytes]]:
+    """
+    Двоичный поток с содержимым лога — без распаковки на диск.
+
+    gz/bz2/xz разжимаются на лету, из zip читается член error.log (или
+    первый *.log); обычный файл открывается как есть. Чтение блоками через
+    read(n) — как у файла, поэтому номера строк совпадают с исходным логом.
+    """
+    path = os.fspath(path)
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ZIP_SUFFIX:
+        with zipfile.ZipFile(path) as zf:
+            name = zip_log_member(zf)
+            if name is None:
+                raise FileNotFoundError(f"{path}: в архиве нет *.log")
+            with zf.open(name) as f:
+                yield f
+    elif suffix in COMPRESSED_OPENERS:
+        with COMPRESSED_OPENERS[suffix](path, "rb") as f:
+            yield f
+    else:
+        with open(path, "rb") as f:
+            yield f
@@ -0,0 +1,370 @@
+import os
+import json
+import mmap
+import hashlib
+import operator
+from array import array
+from itertools import accumulate, islice, repeat
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
+
+from error_classifier import ErrorClassifier, ErrorStore, ParsedError
+
+
+# ─────────────────────────────────────────────
+# 📌 Чекпоинт инкрементального сканирования
+# ─────────────────────────────────────────────
+# Меняется вместе с форматом файла чекпоинта
+CHECKPOINT_VERSION = 1
+# Сколько первых байт лога хэшируется: игра при запуске пишет error.log
+# заново, и новое начало файла выдаёт перезапись даже при том же размере
+HEAD_BYTES = 4096
+# Блок обратного поиска последнего b"\n"
+_TAIL_BLOCK = 64 << 10
+
+
+def head_hash(path: Union[str, os.PathLike], length: int = HEAD_BYTES) -> str:
+    """SHA‑256 первых length байт файла"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+
+def last_line_end(path: Union[str, os.PathLike], start: int, size: int) -> int:
+    """
+    Позиция сразу после последнего b"\\n" в [start, size) (start, если его
+    нет). Всё дальше — строка, которую игра ещё дописывает.
+    """
+    with open(path, "rb") as f:
+        pos = size
+        while pos > start:
+            lo = max(start, pos - _TAIL_BLOCK)
+            f.seek(lo)
+            i = f.read(pos - lo).rfind(b"\n")
+            if i >= 0:
+                return lo + i + 1
+            pos = lo
+    return start
+
+
+def checkpoint_file(cache_dir: Union[str, os.PathLike], log_path: Union[str, os.PathLike]) -> Path:
+    """Файл чекпоинта лога: имя — хэш абсолютного пути"""
+    key = hashlib.sha1(os.path.abspath(log_path).encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir) / f"{key}.json"
+
+
+class LogCheckpoint:
+    """
+    Докуда лог уже разобран: позиция (байт и номер строки после последней
+    целой строки) и состояние ErrorStore на этот момент — вместе с
+    отпечатками повторов, чтобы дописанные строки сливались в счётчики.
+
+    Файл опознаётся по dev/inode, размеру и хэшу первых HEAD_BYTES байт.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        dev: int,
+        ino: int,
+        head_len: int,
+        head_hash: str,
+        offset: int,
+        line: int,
+        encoding: str,
+        patterns: str,
+        store: Dict[str, Any],
+    ):
+        self.log_path = log_path
+        self.dev = dev
+        self.ino = ino
+        self.head_len = head_len
+        self.head_hash = head_hash
+        self.offset = offset
+        self.line = line
+        self.encoding = encoding
+        self.patterns = patterns
+        self.store = store
+
+    # ─────────────────────────────────────────
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> Optional["LogCheckpoint"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.pop("version", None) != CHECKPOINT_VERSION:
+            return None
+        try:
+            return cls(**data)
+        except TypeError:
+            return None
+
+    def save(self, path: Union[str, os.PathLike]):
+        data = {"version": CHECKPOINT_VERSION, **self.__dict__}
+        try:
+            path = os.fspath(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[LogCheckpoint] Не удалось сохранить чекпоинт: {e}")
+
+    # ─────────────────────────────────────────
+    def stale_reason(self, log_path: str, encoding: str, patterns: str) -> Optional[str]:
+        """
+        Почему чекпоинт нельзя продолжить (None — можно):
+        "rotated" — другой файл (dev/inode), "truncated" — файл короче
+        разобранного, "rewritten" — изменилось начало файла,
+        "settings" — другие паттерны или кодировка.
+        """
+        try:
+            st = os.stat(log_path)
+        except OSError:
+            return "rotated"
+        if patterns != self.patterns or encoding != self.encoding:
+            return "settings"
+        if (st.st_dev, st.st_ino) != (self.dev, self.ino):
+            return "rotated"
+        if st.st_size < self.offset:
+            return "truncated"
+        if head_hash(log_path, self.head_len) != self.head_hash:
+            return "rewritten"
+        return None
+
+
+# ─────────────────────────────────────────────
+# 🧭 Индекс смещений строк
+# ─────────────────────────────────────────────
+class LineIndex:
+    """
+    Байтовые смещения начала строк лога: offsets[n - 1] — начало строки n
+    (нумерация с 1, как log_line). Последний элемент — начало ещё не
+    завершённой строки (или конец файла). 8 байт на строку в array('Q').
+    """
+
+    def __init__(self, offsets: Optional[array] = None):
+        self.offsets = offsets if offsets is not None else array("Q", [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def end(self) -> int:
+        """Докуда файл проиндексирован (байт)"""
+        return self.offsets[-1]
+
+    def extend(self, path: Union[str, os.PathLike], end: int, chunk_size: int = 1 << 20):
+        """Дописывает начала строк из [self.end, end) файла"""
+        offsets = self.offsets
+        with open(path, "rb") as f:
+            pos = self.end
+            f.seek(pos)
+            while pos < end:
+                chunk = f.read(min(chunk_size, end - pos))
+                if not chunk:
+                    break
+                # конец каждой строки = pos + накопленные (длина куска + 1);
+                # кусок без b"\n" в конце блока в счёт не идёт
+                parts = chunk.split(b"\n")
+                parts.pop()
+                steps = map(operator.add, map(len, parts), repeat(1))
+                offsets.extend(islice(accumulate(steps, initial=pos), 1, None))
+                pos += len(chunk)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> Optional["LineIndex"]:
+        offsets = array("Q")
+        try:
+            with open(path, "rb") as f:
+                offsets.frombytes(f.read())
+        except (OSError, ValueError):
+            return None
+        return cls(offsets) if offsets else None
+
+    def save(self, path: Union[str, os.PathLike]):
+        try:
+            path = os.fspath(path)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                self.offsets.tofile(f)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[LineIndex] Не удалось сохранить индекс строк: {e}")
+
+
+class LogLines:
+    """
+    Чтение строк лога по номеру через mmap и LineIndex — без чтения файла
+    целиком: строка N и окрестность N±k берутся срезом по смещениям.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], index: LineIndex, encoding: str = "utf-8"):
+        self.path = os.fspath(path)
+        self.index = index
+        self.encoding = encoding
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # пустой файл
+            self._mm = None
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "LogLines":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def line(self, n: int) -> Optional[str]:
+        """Строка n (с 1) без перевода строки; None — вне файла"""
+        offsets = self.index.offsets
+        mm = self._mm
+        if mm is None or not 1 <= n <= len(offsets):
+            return None
+        start = offsets[n - 1]
+        if n < len(offsets):
+            end = offsets[n]
+        else:
+            # недописанная последняя строка — до b"\n" или конца отображения
+            end = mm.find(b"\n", start)
+            end = len(mm) if end < 0 else end + 1
+        if start >= len(mm):
+            return None
+        raw = mm[start:min(end, len(mm))]
+        if raw.endswith(b"\n"):
+            raw = raw[:-1]
+        if raw.endswith(b"\r"):
+            raw = raw[:-1]
+        return raw.decode(self.encoding, errors="replace")
+
+    def context(self, n: int, k: int = 3) -> List[Tuple[int, str]]:
+        """Строки n-k..n+k как (номер, текст)"""
+        lines = []
+        for i in range(max(1, n - k), n + k + 1):
+            text = self.line(i)
+            if text is None:
+                break
+            lines.append((i, text))
+        return lines
+
+
+# ─────────────────────────────────────────────
+# 🔁 Повторное сканирование растущего лога
+# ─────────────────────────────────────────────
+class IncrementalScan:
+    """
+    Сканирование error.log с продолжением с чекпоинта.
+
+        scan = IncrementalScan(classifier, log_path, "utf-8", "cache/checkpoints")
+        for err in scan.run():      # только новые ошибки
+            ...
+        scan.save()                 # после полного прохода
+
+    Если чекпоинт подходит, разбираются только дописанные байты, а
+    результаты сливаются в восстановленный ErrorStore (scan.resumed,
+    scan.first_line). Иначе — полный проход; scan.reason объясняет почему.
+
+    Незавершённая последняя строка классифицируется, но в чекпоинт не
+    попадает: следующий проход прочитает её заново уже целиком.
+
+    Попутно ведётся LineIndex (scan.lines, файл *.lines рядом с
+    чекпоинтом) — по нему open_lines() читает строки лога по номеру.
+    """
+
+    def __init__(
+        self,
+        classifier: ErrorClassifier,
+        log_path: Union[str, os.PathLike],
+        encoding: str,
+        cache_dir: Union[str, os.PathLike],
+        sample_size: int = 0,
+    ):
+        self.classifier = classifier
+        self.log_path = os.path.abspath(log_path)
+        self.encoding = encoding
+        self.checkpoint_path = checkpoint_file(cache_dir, self.log_path)
+        self.index_path = self.checkpoint_path.with_suffix(".lines")
+        self.lines = LineIndex()
+        self.resumed = False
+        self.reason: Optional[str] = None
+        self.offset = 0
+        self.first_line = 1
+        self.store = ErrorStore(sample_size=sample_size)
+        self._checkpoint: Optional[LogCheckpoint] = None
+
+        old = LogCheckpoint.load(self.checkpoint_path)
+        if old is None:
+            self.reason = "new"
+            return
+        self.reason = old.stale_reason(self.log_path, encoding, classifier.fingerprint)
+        if self.reason is None:
+            try:
+                self.store = ErrorStore.from_state(old.store)
+            except (KeyError, TypeError, ValueError):
+                self.reason = "new"
+                return
+            self.resumed = True
+            self.offset = old.offset
+            self.first_line = old.line
+            index = LineIndex.load(self.index_path)
+            # индекс от другого прохода (или потерян) — перестроится в run()
+            if index is not None and len(index) == old.line and index.end == old.offset:
+                self.lines = index
+
+    # ─────────────────────────────────────────
+    def run(self, workers: Optional[int] = 1) -> Iterator[ParsedError]:
+        """Классифицирует лог с self.offset до конца; отдаёт новые ошибки"""
+        path = self.log_path
+        st = os.stat(path)
+        size = st.st_size
+        end = last_line_end(path, self.offset, size)
+        clf = self.classifier
+        yield from clf.iter_classify(
+            path, encoding=self.encoding, workers=workers, store=self.store,
+            start=self.offset, end=end, first_line=self.first_line)
+
+        # состояние до недописанной строки — это и есть чекпоинт
+        if len(self.lines) != self.first_line or self.lines.end != self.offset:
+            self.lines = LineIndex()
+        self.lines.extend(path, end)
+        n_lines = len(self.lines) - 1
+        head_len = min(HEAD_BYTES, end)
+        self._checkpoint = LogCheckpoint(
+            log_path=path,
+            dev=st.st_dev,
+            ino=st.st_ino,
+            head_len=head_len,
+            head_hash=head_hash(path, head_len),
+            offset=end,
+            line=n_lines + 1,
+            encoding=self.encoding,
+            patterns=clf.fingerprint,
+            store=self.store.to_state(),
+        )
+        if end < size:
+            yield from clf.iter_classify(
+                path, encoding=self.encoding, workers=1, store=self.store,
+                start=end, end=size, first_line=n_lines + 1)
+
+    def save(self):
+        """Записывает чекпоинт последнего завершённого run()"""
+        if self._checkpoint is not None:
+            self.lines.save(self.index_path)
+            self._checkpoint.save(self.checkpoint_path)
+
+    def open_lines(self) -> LogLines:
+        """Читатель строк лога по номеру (после run())"""
+        return LogLines(self.log_path, self.lines, self.encoding)
+
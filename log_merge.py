@@ -0,0 +1,203 @@
+import os
+import heapq
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
+
+from error_classifier import ErrorClassifier, ErrorStore, ParsedError, ascii_compatible
+from error_store import SessionClock
+from error_patterns import log_pattern_sets
+from log_archive import is_archive, open_log_stream
+from log_checkpoint import LineIndex
+from text_encoding import detect_file_encoding
+
+
+# ─────────────────────────────────────────────
+# 🔀 Слияние логов сессии по времени
+# ─────────────────────────────────────────────
+# Записей в одной передаче из потока‑читателя (меньше накладных на очередь)
+BATCH_SIZE = 512
+# Сколько пакетов может ждать в очереди одного лога: читатель, ушедший
+# вперёд остальных, останавливается, и память не растёт с размером логов
+QUEUE_BATCHES = 16
+# Сколько байт смотреть при определении кодировки каждого лога
+ENCODING_SAMPLE = 1 << 20
+
+# Конец потока записей одного лога
+_END = object()
+
+# Запись слияния: (ключ сортировки, log_line, time, source, поля)
+Record = Tuple[int, int, Optional[int], Optional[str], tuple]
+
+
+def find_session_logs(
+    logs_dir: Union[str, os.PathLike], names: Optional[List[str]] = None
+) -> Dict[str, Path]:
+    """Имя → путь для логов папки logs/, для которых есть набор паттернов"""
+    logs_dir = Path(logs_dir)
+    found = {}
+    for name in names or list(log_pattern_sets):
+        path = logs_dir / name
+        if path.is_file() and path.stat().st_size:
+            found[name] = path
+    return found
+
+
+def sort_keys(
+    matches: Iterator[Tuple[int, Optional[int], Optional[str], tuple]]
+) -> Iterator[Record]:
+    """
+    Добавляет к совпадениям ключ сортировки — секунды от начала сессии.
+
+    В логе только «[hh:mm:ss]»: переход через полночь считает SessionClock,
+    строка без префикса наследует предыдущее время. Внутри одного лога
+    ключ не убывает — это и нужно heapq.merge.
+    """
+    clock = SessionClock()
+    last = 0
+    for log_line, seconds, source, fields in matches:
+        if seconds is not None:
+            last = max(last, clock.advance(seconds))
+        yield last, log_line, seconds, source, fields
+
+
+class MultiLogScan:
+    """
+    Параллельный разбор нескольких логов одной сессии с общей лентой по
+    времени.
+
+        scan = MultiLogScan(find_session_logs(logs_dir), sample_size=10)
+        for err in scan.run():      # error.log, game.log, debug.log вперемешку
+            ...
+        scan.store.get(row, "log")  # из какого лога строка
+
+    Каждый лог читает свой поток со своим ErrorClassifier (паттерны —
+    log_pattern_sets[имя]) и передаёт совпадения пакетами через
+    ограниченную очередь. Главный поток сливает их heapq.merge по ключу
+    времени и сам наполняет ErrorStore — хранилище не делится между
+    потоками. При равном времени раньше идёт лог, стоящий раньше в paths.
+
+    Логи целиком в память не читаются: в очередях не больше QUEUE_BATCHES
+    пакетов на лог. Попутно для обычных (не архивных) файлов в
+    ASCII‑совместимой кодировке строится LineIndex — scan.lines[имя] — для просмотра строк вокруг ошибки.
+    """
+
+    def __init__(
+        self,
+        paths: Dict[str, Union[str, os.PathLike]],
+        classifiers: Optional[Dict[str, ErrorClassifier]] = None,
+        encodings: Optional[Dict[str, str]] = None,
+        sample_size: int = 0,
+        store: Optional[ErrorStore] = None,
+        index_lines: bool = True,
+    ):
+        self.paths = {name: Path(p) for name, p in paths.items()}
+        self.classifiers = dict(classifiers or {})
+        for name in self.paths:
+            if name not in self.classifiers:
+                patterns = log_pattern_sets.get(name, log_pattern_sets["error.log"])
+                self.classifiers[name] = ErrorClassifier(patterns, verbose=False)
+        self.encodings = dict(encodings or {})
+        self.store = store if store is not None else ErrorStore(sample_size=sample_size)
+        self.index_lines = index_lines
+        self.lines: Dict[str, LineIndex] = {}
+        self.errors: Dict[str, str] = {}
+
+    # ─────────────────────────────────────────
+    def encoding(self, name: str) -> str:
+        """Кодировка лога (определяется один раз по первым ENCODING_SAMPLE байт)"""
+        enc = self.encodings.get(name)
+        if enc is None:
+            with open_log_stream(self.paths[name]) as f:
+                enc = self.encodings[name] = detect_file_encoding(f, limit=ENCODING_SAMPLE)
+        return enc
+
+    def _read(self, name: str, out: queue.Queue, stop: threading.Event):
+        """Поток‑читатель: совпадения одного лога пакетами в очередь"""
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        path = self.paths[name]
+        try:
+            matches = self.classifiers[name].iter_matches(path, encoding=self.encoding(name))
+            batch: List[Record] = []
+            for rec in sort_keys(matches):
+                batch.append(rec)
+                if len(batch) >= BATCH_SIZE:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            # индекс строит поток, пока слияние ждёт его _END: после полного
+            # прохода scan.lines уже заполнен
+            # LineIndex режет строки по b"\n" — для UTF‑16/32 он бы врал
+            if self.index_lines and not is_archive(path) and ascii_compatible(self.encoding(name)):
+                index = LineIndex()
+                index.extend(path, path.stat().st_size)
+                self.lines[name] = index
+        except Exception as e:
+            self.errors[name] = str(e)
+            print(f"[MultiLogScan] {name}: {e}")
+        finally:
+            put(_END)
+
+    @staticmethod
+    def _drain(name: str, out: queue.Queue) -> Iterator[Tuple[str, Record]]:
+        """(имя, запись) одного лога из очереди его читателя — по порядку"""
+        while True:
+            batch = out.get()
+            if batch is _END:
+                return
+            for rec in batch:
+                yield name, rec
+
+    def iter_records(self) -> Iterator[Tuple[str, Record]]:
+        """
+        Единая лента (имя лога, запись) всех логов по возрастанию времени.
+        Прерванный проход (close генератора) останавливает читателей.
+        """
+        stop = threading.Event()
+        queues = {name: queue.Queue(maxsize=QUEUE_BATCHES) for name in self.paths}
+        threads = [
+            threading.Thread(target=self._read, args=(name, q, stop), daemon=True,
+                             name=f"log-reader-{name}")
+            for name, q in queues.items()
+        ]
+        for t in threads:
+            t.start()
+        streams = [self._drain(name, q) for name, q in queues.items()]
+        try:
+            yield from heapq.merge(*streams, key=lambda item: item[1][0])
+        finally:
+            # читатели завершатся сами на следующей попытке отдать пакет
+            stop.set()
+
+    def run(self, deduplicate: bool = True) -> Iterator[ParsedError]:
+        """
+        Классифицирует все логи; ошибки отдаются в порядке времени.
+        deduplicate — как в iter_classify, но повторы считаются отдельно для
+        каждого лога (колонка log входит в отпечаток).
+        """
+        store = self.store
+        view = ParsedError._view
+        for name, (_key, log_line, seconds, source, fields) in self.iter_records():
+            ids = store.intern_fields(fields)
+            if deduplicate:
+                row, new = store.add_occurrence(ids, log_line, seconds, source, log=name)
+                if new:
+                    yield view(store, row)
+            else:
+                yield view(store, store.append_ids(ids, log_line, seconds, source, name))
+
+    def stats(self) -> Dict[str, Any]:
+        """Вхождений по логам (после run())"""
+        return self.store.counts("log", occurrences=True)
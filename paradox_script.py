@@ -0,0 +1,169 @@
+import re
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+
+# ─────────────────────────────────────────────
+# 📜 Токенизатор Paradox script
+# ─────────────────────────────────────────────
+# Токены: строка в кавычках (незакрытая — до конца строки), оператор,
+# фигурные скобки, слово; пробелы и «# комментарии» пропускаются
+_TOKEN = re.compile(
+    r"""
+    (?P<skip>\s+|\#[^\n]*)
+  | "(?P<str>(?:[^"\\\n]|\\.)*)"?
+  | (?P<op><=|>=|!=|==|\?=|[=<>])
+  | (?P<brace>[{}])
+  | (?P<word>[^\s{}=<>!?"\#]+|[!?])
+    """,
+    re.VERBOSE,
+)
+
+# Токен: (вид — "str" | "op" | "brace" | "word", значение)
+Token = Tuple[str, str]
+# Разобранный блок: пары (ключ, значение) и одиночные значения списков
+# («tags = { "A" "B" }»); значение — строка или вложенный блок
+Block = List[Union[Tuple[str, Any], str]]
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Токены текста по порядку"""
+    for m in _TOKEN.finditer(text):
+        kind = m.lastgroup
+        if kind == "skip":
+            continue
+        value = m.group(kind)
+        if kind == "str":
+            value = value.replace('\\"', '"')
+        yield kind, value
+
+
+def parse(text: str) -> Block:
+    """
+    Текст скрипта → вложенные блоки. Разбор не падает на битых файлах:
+    лишняя «}» пропускается, незакрытые блоки закрываются концом текста,
+    ключ без значения отбрасывается.
+    """
+    root: Block = []
+    stack = [root]
+    pending_key = None     # ключ, за которым ждём оператор
+    want_value = None      # ключ, для которого ждём значение
+    for kind, value in tokenize(text):
+        block = stack[-1]
+        if kind == "op":
+            if pending_key is not None:
+                want_value, pending_key = pending_key, None
+            continue
+        if kind == "brace":
+            if value == "{":
+                child: Block = []
+                if want_value is not None:
+                    block.append((want_value, child))
+                else:
+                    if pending_key is not None:
+                        block.append(pending_key)
+                    block.append(("", child))
+                pending_key = want_value = None
+                stack.append(child)
+            else:
+                if pending_key is not None:
+                    block.append(pending_key)
+                pending_key = want_value = None
+                if len(stack) > 1:
+                    stack.pop()
+            continue
+        # строка или слово
+        if want_value is not None:
+            block.append((want_value, value))
+            want_value = None
+        else:
+            if pending_key is not None:
+                block.append(pending_key)
+            pending_key = value
+    if pending_key is not None:
+        stack[-1].append(pending_key)
+    return root
+
+
+# ─────────────────────────────────────────────
+# 🔑 Ключи верхнего уровня
+# ─────────────────────────────────────────────
+# Только то, что влияет на глубину скобок и на «слово =»: комментарии и
+# строки проглатываются целиком (скобки внутри них не считаются), слово
+# без следующего «=» пропускается отдельной веткой
+_KEY_SCAN = re.compile(
+    r"""
+    \#[^\n]*
+  | "(?:[^"\\\n]|\\.)*"?
+  | (?P<brace>[{}])
+  | (?P<key>[^\s{}=<>!?"\#]+)(?=[ \t\r\n]*\??=(?!=))
+  | [^\s{}=<>!?"\#]+
+    """,
+    re.VERBOSE,
+)
+# Ключи верхнего уровня, которые не объявляют объекты
+_NOT_OBJECTS = frozenset(("namespace",))
+
+
+def top_level_keys(text: str) -> List[str]:
+    """
+    Ключи «ключ = …» на нулевой глубине скобок — объекты, которые файл
+    объявляет (трейты, решения, on_action…), по порядку, без повторов.
+
+    Это не разбор, а один проход регулярным выражением со счётчиком
+    глубины: в разы быстрее parse() и не строит дерево. Переменные
+    «@name = …» и namespace не объекты и пропускаются; лишняя «}» глубину
+    ниже нуля не опускает.
+    """
+    keys: List[str] = []
+    seen = set()
+    depth = 0
+    for m in _KEY_SCAN.finditer(text):
+        brace = m.group("brace")
+        if brace:
+            if brace == "{":
+                depth += 1
+            elif depth:
+                depth -= 1
+            continue
+        key = m.group("key")
+        if key and not depth and key[0] != "@" and key not in seen and key.lower() not in _NOT_OBJECTS:
+            seen.add(key)
+            keys.append(key)
+    return keys
+
+
+# ─────────────────────────────────────────────
+# 📄 descriptor.mod / *.mod
+# ─────────────────────────────────────────────
+# Одиночные поля дескриптора (берётся последнее значение)
+DESCRIPTOR_SCALARS = ("name", "version", "supported_version", "path", "remote_file_id", "picture")
+# Поля‑списки («dependencies = { "A" "B" }», replace_path может повторяться)
+DESCRIPTOR_LISTS = ("tags", "dependencies", "replace_path")
+
+
+def empty_descriptor() -> Dict[str, Any]:
+    info: Dict[str, Any] = {key: None for key in DESCRIPTOR_SCALARS}
+    info.update({key: [] for key in DESCRIPTOR_LISTS})
+    return info
+
+
+def parse_descriptor(text: str) -> Dict[str, Any]:
+    """
+    Поля дескриптора мода: DESCRIPTOR_SCALARS — строки (или None),
+    DESCRIPTOR_LISTS — списки строк. Ключи без учёта регистра,
+    прочие поля игнорируются.
+    """
+    info = empty_descriptor()
+    for item in parse(text):
+        if not isinstance(item, tuple):
+            continue
+        key, value = item[0].lower(), item[1]
+        if key in DESCRIPTOR_SCALARS:
+            if isinstance(value, str):
+                info[key] = value
+        elif key in DESCRIPTOR_LISTS:
+            if isinstance(value, str):
+                info[key].append(value)
+            else:
+                info[key] += [v for v in value if isinstance(v, str)]
+    return info
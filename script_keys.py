@@ -0,0 +1,195 @@
+import os
+import json
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, List, NamedTuple, Tuple, Union
+
+from load_order import FileResolver
+from paradox_script import top_level_keys
+from text_encoding import read_text
+from workshop_index import IndexedFile
+
+
+# ─────────────────────────────────────────────
+# 🔑 Индекс объектов common/ по модам
+# ─────────────────────────────────────────────
+# Меняется вместе с форматом файла кэша (или правилами top_level_keys)
+CACHE_VERSION = 1
+# Какие файлы модов разбираются
+SCRIPT_PREFIX = "common/"
+SCRIPT_SUFFIX = ".txt"
+# Меньше стольких файлов разбирается в текущем процессе: запуск пула дороже
+POOL_MIN_FILES = 64
+# Файлов в одной задаче пула
+POOL_CHUNK = 32
+
+# Папки, где одноимённые объекты игра сливает, а не заменяет: у on_action
+# дописываются списки events / on_actions, у defines — отдельные значения
+MERGING_FOLDERS = frozenset(("common/on_action", "common/defines"))
+
+# Определение объекта: (mod_id, ключ файла — путь относительно мода)
+Definition = Tuple[str, str]
+
+
+def file_keys(path: str) -> Optional[List[str]]:
+    """Ключи верхнего уровня файла (None — файл не прочитать); выполняется в пуле"""
+    try:
+        text, _enc = read_text(path)
+    except OSError:
+        return None
+    return top_level_keys(text)
+
+
+class KeyConflict(NamedTuple):
+    """
+    Объект, который объявляют несколько модов: definitions — все
+    определения, попадающие в игру, по порядку загрузки; winner — то, что
+    останется в игре (остальные перекрыты им), или None, если объект
+    из MERGING_FOLDERS и определения сливаются.
+    """
+    definitions: List[Definition]
+    winner: Optional[Definition]
+
+    @property
+    def merged(self) -> bool:
+        return self.winner is None
+
+
+class ScriptKeyIndex:
+    """
+    «папка:ключ» → моды, которые объявляют этот объект в common/**.txt.
+
+        keys = ScriptKeyIndex("cache/script_keys.json")
+        defs = keys.build(snapshot.files)      # "common/traits:brave" → [(mod_id, файл)…]
+        conflicts = object_conflicts(defs, resolver)   # "…:ключ" → KeyConflict
+        keys.hits, keys.misses
+        keys.save()
+
+    Объекты одного типа живут в одной папке (common/traits, common/decisions),
+    поэтому ключ индекса — папка файла плюс имя объекта. Файлы, которых нет
+    в кэше (по пути, размеру и mtime), разбираются top_level_keys в пуле
+    процессов — это чистый CPU.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], workers: Optional[int] = None):
+        self.path = os.fspath(path)
+        self.workers = workers or os.cpu_count() or 1
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        # абсолютный путь → [размер, mtime_ns, ключи]
+        self._entries: Dict[str, list] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    # ─────────────────────────────────────────
+    def _parse(self, paths: List[str], progress: Optional[queue.Queue]) -> List[Optional[List[str]]]:
+        if len(paths) < POOL_MIN_FILES or self.workers < 2:
+            return [file_keys(p) for p in paths]
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for i, keys in enumerate(pool.map(file_keys, paths, chunksize=POOL_CHUNK), 1):
+                results.append(keys)
+                if progress is not None and (i % 500 == 0 or i == len(paths)):
+                    progress.put(("keys", i, len(paths)))
+        return results
+
+    def build(
+        self,
+        files: Dict[str, Dict[str, IndexedFile]],
+        progress: Optional[queue.Queue] = None,
+    ) -> Dict[str, List[Definition]]:
+        """
+        Все объявления объектов по модам files (результат
+        WorkshopIndex.build / WorkshopSnapshot.files), в порядке модов.
+        Размер и mtime берутся свежим stat: правка файла не меняет mtime
+        каталога, по которому обновляется снимок.
+        """
+        self.hits = self.misses = 0
+        found: List[Tuple[str, str, Optional[List[str]]]] = []
+        todo: List[Tuple[int, str, List[int]]] = []
+        for mod_id, mod_files in files.items():
+            for key, f in mod_files.items():
+                if not (key.startswith(SCRIPT_PREFIX) and key.endswith(SCRIPT_SUFFIX)):
+                    continue
+                abs_path = os.path.abspath(f.path)
+                try:
+                    st = os.stat(abs_path)
+                except OSError:
+                    continue
+                stamp = [st.st_size, st.st_mtime_ns]
+                known = self._entries.get(abs_path)
+                if known and known[:2] == stamp:
+                    found.append((mod_id, key, known[2]))
+                    self.hits += 1
+                else:
+                    todo.append((len(found), abs_path, stamp))
+                    found.append((mod_id, key, None))
+
+        if todo:
+            parsed = self._parse([p for _, p, _ in todo], progress)
+            for (i, abs_path, stamp), keys in zip(todo, parsed):
+                mod_id, key, _ = found[i]
+                found[i] = (mod_id, key, keys)
+                if keys is not None:
+                    self._entries[abs_path] = stamp + [keys]
+            self.misses = len(todo)
+            self._dirty = True
+
+        defs: Dict[str, List[Definition]] = {}
+        for mod_id, key, keys in found:
+            folder = key.rpartition("/")[0]
+            for name in keys or ():
+                defs.setdefault(f"{folder}:{name}", []).append((mod_id, key))
+        return defs
+
+    def save(self):
+        """Записывает кэш (если что‑то разбиралось), выбрасывая удалённые файлы"""
+        if not self._dirty:
+            return
+        entries = {k: v for k, v in self._entries.items() if os.path.exists(k)}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self._entries = entries
+            self._dirty = False
+        except OSError as e:
+            print(f"[ScriptKeyIndex] Не удалось сохранить кэш: {e}")
+
+
+def object_conflicts(
+    defs: Dict[str, List[Definition]], resolver: FileResolver
+) -> Dict[str, KeyConflict]:
+    """
+    Объекты, которые объявляют ≥2 мода в файлах, реально попадающих в игру.
+
+    Файл, перекрытый тем же путём в более позднем моде или выброшенный
+    replace_path (FileResolver), в счёт не идёт — это конфликт файлов, а не
+    объектов. Из оставшихся побеждает загружаемое последним: файлы папки
+    игра читает по имени, при равном имени — по порядку загрузки модов
+    (трейты, решения и прочие заменяемые типы). В MERGING_FOLDERS
+    победителя нет: определения сливаются (winner — None).
+    """
+    conflicts: Dict[str, KeyConflict] = {}
+    for name, found in defs.items():
+        if len({mod_id for mod_id, _ in found}) < 2:
+            continue
+        live = []
+        for mod_id, key in found:
+            res = resolver.resolve(key)
+            if res is not None and res.winner is not None and res.winner[0] == mod_id:
+                live.append((mod_id, key))
+        if len({mod_id for mod_id, _ in live}) < 2:
+            continue
+        live.sort(key=lambda d: (d[1].rpartition("/")[2], resolver.rank.get(d[0], -1)))
+        merged = name.rpartition(":")[0] in MERGING_FOLDERS
+        conflicts[name] = KeyConflict(live, None if merged else live[-1])
+    return conflicts
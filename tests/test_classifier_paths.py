@@ -0,0 +1,71 @@
+"""The str, bytes and parallel classification paths agree on a fixture log"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import error_classifier
+from error_classifier import ErrorClassifier
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "error.log")
+
+
+def rows(errors):
+    return [(e.type, e.file, e.line, e.log_line, e.count) for e in errors]
+
+
+class ClassifierPathsTest(unittest.TestCase):
+    def setUp(self):
+        self.classifier = ErrorClassifier(verbose=False)
+
+    def classify(self, deduplicate=True, **kwargs):
+        return rows(self.classifier.iter_classify(FIXTURE, deduplicate=deduplicate, **kwargs))
+
+    def reference(self):
+        """classify_line on every decoded line — no prefilter, no chunking"""
+        with open(FIXTURE, "rb") as f:
+            lines = f.read().decode("utf-8").splitlines()
+        found = []
+        for i, line in enumerate(lines, start=1):
+            error = self.classifier.classify_line(line)
+            if error:
+                found.append((error.type, error.file, error.line, i, 1))
+        return found
+
+    def test_fixture_has_matches(self):
+        found = self.reference()
+        self.assertGreater(len(found), 20)
+        self.assertGreater(len({r[0] for r in found}), 5)
+
+    def test_str_and_bytes_paths_agree(self):
+        expected = self.reference()
+        self.assertEqual(self.classify(deduplicate=False, bytes_mode=False), expected)
+        self.assertEqual(self.classify(deduplicate=False, bytes_mode=True), expected)
+        # small blocks split lines and CRLF pairs across reads
+        self.assertEqual(self.classify(deduplicate=False, chunk_size=37), expected)
+        self.assertEqual(
+            self.classify(deduplicate=False, chunk_size=37, bytes_mode=False), expected)
+
+    def test_parallel_path_agrees(self):
+        for deduplicate in (False, True):
+            serial = self.classify(deduplicate, bytes_mode=False)
+            # the fixture is tiny: lower the limits so it is split into ranges
+            with mock.patch.object(error_classifier, "PARALLEL_MIN_SIZE", 0), \
+                    mock.patch.object(error_classifier, "MIN_RANGE_SIZE", 512):
+                for bytes_mode in (True, False):
+                    with self.subTest(deduplicate=deduplicate, bytes_mode=bytes_mode):
+                        self.assertEqual(
+                            self.classify(deduplicate, workers=4, bytes_mode=bytes_mode),
+                            serial)
+
+    def test_ranges_cover_fixture(self):
+        size = os.path.getsize(FIXTURE)
+        with mock.patch.object(error_classifier, "MIN_RANGE_SIZE", 512):
+            ranges = error_classifier.split_line_ranges(FIXTURE, 4, 0, size)
+        self.assertGreater(len(ranges), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Smoke test: CK3LogParser starts without a display (Tk is stubbed)"""
+import os
+import sys
+import types
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# the tray icon dependencies are optional at test time
+for name in ("pystray", "PIL"):
+    if name not in sys.modules:
+        try:
+            __import__(name)
+        except ImportError:
+            stub = types.ModuleType(name)
+            stub.Image = mock.MagicMock()
+            sys.modules[name] = stub
+
+import ck3_log_parser
+
+
+class FakeVar:
+    """tk.StringVar / tk.BooleanVar without a Tk interpreter"""
+
+    def __init__(self, master=None, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def trace_add(self, *args, **kwargs):
+        pass
+
+
+class StartupTest(unittest.TestCase):
+    def setUp(self):
+        # caches and config.json are relative to the working directory
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_builds_with_stubbed_root(self):
+        tk = mock.MagicMock()
+        tk.StringVar = tk.BooleanVar = tk.IntVar = FakeVar
+        tk.END, tk.LEFT, tk.RIGHT, tk.BOTH, tk.X, tk.Y = "end", "left", "right", "both", "x", "y"
+        with mock.patch.multiple(
+            ck3_log_parser, tk=tk, ttk=mock.MagicMock(), scrolledtext=mock.MagicMock(),
+            filedialog=mock.MagicMock(), messagebox=mock.MagicMock(),
+        ):
+            root = mock.MagicMock()
+            app = ck3_log_parser.CK3LogParser(root)
+        self.assertIs(app.snapshot.index, app.workshop_index)
+        self.assertIs(app.snapshot.descriptors, app.descriptors)
+        root.after.assert_called()
+        app.loc_index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+import codecs
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, List, Tuple, Union
+
+try:
+    import chardet
+except ImportError:  # без chardet остаются BOM и UTF‑8
+    chardet = None
+
+
+# ─────────────────────────────────────────────
+# 🔤 Определение кодировки
+# ─────────────────────────────────────────────
+# Сколько байт отдаётся chardet, если строгий UTF‑8 не прошёл
+SAMPLE_SIZE = 1 << 20
+# Размер блока чтения
+READ_CHUNK_SIZE = 1 << 20
+
+# UTF‑32 проверяется раньше UTF‑16: BOM_UTF32_LE начинается с BOM_UTF16_LE
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def sniff_bom(head: bytes) -> Optional[str]:
+    """Кодировка по BOM в начале данных (None — BOM нет)"""
+    for bom, enc in _BOMS:
+        if head.startswith(bom):
+            return enc
+    return None
+
+
+class EncodingDetector:
+    """
+    Инкрементальное определение кодировки: данные подаются блоками (feed),
+    ответ — в result().
+
+    Порядок: BOM → строгий UTF‑8 по всем поданным данным (без копирования,
+    через инкрементальный декодер) → chardet, но только на ограниченной
+    выборке, начиная с места, где UTF‑8 сломался (всё до него — ASCII/UTF‑8
+    и о прежней кодировке ничего не говорит). ASCII и UTF‑8 с редкими
+    битыми байтами считаются UTF‑8.
+    """
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.bom: Optional[str] = None
+        self.utf8_ok = True
+        self._started = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")("strict")
+        self._bad: List[bytes] = []
+        self._bad_len = 0
+
+    def feed(self, chunk: bytes, final: bool = False) -> Optional[str]:
+        """
+        Подаёт следующий блок; возвращает его текст, пока данные — валидный
+        UTF‑8 (None после первой ошибки или для не‑UTF‑8 BOM).
+        final=True — блок последний (незавершённая UTF‑8 последовательность
+        в конце — уже ошибка).
+        """
+        if not self._started:
+            self._started = True
+            self.bom = sniff_bom(chunk)
+            if self._other_bom:
+                self.utf8_ok = False
+            elif self.bom:
+                chunk = chunk[len(codecs.BOM_UTF8):]
+        if not self.utf8_ok:
+            self._add_sample(chunk)
+            return None
+        pending = self._decoder.getstate()[0]
+        try:
+            return self._decoder.decode(chunk, final)
+        except UnicodeDecodeError as e:
+            # e.start отсчитывается от недекодированного хвоста прошлого блока
+            self.utf8_ok = False
+            self._add_sample((pending + chunk)[max(0, e.start - 64):])
+            return None
+
+    def _add_sample(self, chunk: bytes):
+        room = self.sample_size - self._bad_len
+        if room > 0 and chunk and not self._other_bom:
+            self._bad.append(chunk[:room])
+            self._bad_len += len(self._bad[-1])
+
+    @property
+    def done(self) -> bool:
+        """Ответ уже не изменится — читать дальше незачем"""
+        if self.utf8_ok:
+            return False
+        return self._other_bom or self._bad_len >= self.sample_size
+
+    @property
+    def _other_bom(self) -> bool:
+        """BOM UTF‑16/32: кодировка известна, UTF‑8 не проверяется"""
+        return self.bom is not None and self.bom != "utf-8-sig"
+
+    def result(self) -> str:
+        """Итоговая кодировка (вызывать после последнего feed)"""
+        if self.utf8_ok:
+            return self.bom or "utf-8"
+        if self._other_bom:
+            return self.bom
+        sample = b"".join(self._bad)
+        # UTF‑8 с отдельными битыми байтами (обычное дело в error.log)
+        # остаётся UTF‑8 — декодируется с errors="replace"
+        text = sample.decode("utf-8", errors="replace")
+        broken = text.count("\ufffd")
+        utf8 = self.bom or "utf-8"
+        if sum(1 for ch in text if ch > "\x7f") - broken > broken:
+            return utf8
+        enc = chardet.detect(sample)["encoding"] if chardet and sample else None
+        if not enc:
+            return utf8
+        return utf8 if enc.lower() in ("ascii", "utf-8") else enc
+
+
+# ─────────────────────────────────────────────
+# 📖 Чтение с определением кодировки
+# ─────────────────────────────────────────────
+@contextmanager
+def _binary(source: Union[str, Path, IO[bytes]]) -> Iterator[IO[bytes]]:
+    """Путь → открытый файл; уже открытый бинарный поток — как есть"""
+    if hasattr(source, "read"):
+        yield source
+    else:
+        with open(source, "rb") as f:
+            yield f
+
+
+def detect_encoding(data: bytes, sample_size: int = SAMPLE_SIZE) -> str:
+    """Кодировка байтов, уже прочитанных в память"""
+    det = EncodingDetector(sample_size)
+    det.feed(data, final=True)
+    return det.result()
+
+
+def detect_file_encoding(
+    path: Union[str, Path, IO[bytes]], limit: Optional[int] = None, sample_size: int = SAMPLE_SIZE
+) -> str:
+    """
+    Кодировка файла (или бинарного потока, например из архива);
+    limit — проверить только первые limit байт (обрезанная на границе
+    UTF‑8 последовательность ошибкой не считается).
+    """
+    det = EncodingDetector(sample_size)
+    left = limit
+    with _binary(path) as f:
+        while left is None or left > 0:
+            chunk = f.read(READ_CHUNK_SIZE if left is None else min(READ_CHUNK_SIZE, left))
+            if not chunk:
+                break
+            if left is not None:
+                left -= len(chunk)
+            det.feed(chunk)
+            if det.done:
+                break
+    if det.utf8_ok and left is None:
+        det.feed(b"", final=True)
+    return det.result()
+
+
+def read_text(
+    path: Union[str, Path, IO[bytes]], sample_size: int = SAMPLE_SIZE
+) -> Tuple[str, str]:
+    """
+    Читает файл (или бинарный поток) один раз и возвращает (текст, кодировка).
+
+    Пока данные — валидный UTF‑8, текст собирается прямо из вывода
+    детектора; иначе те же байты декодируются найденной кодировкой
+    (errors="replace").
+    """
+    det = EncodingDetector(sample_size)
+    raw: List[bytes] = []
+    parts: List[str] = []
+    with _binary(path) as f:
+        while True:
+            chunk = f.read(READ_CHUNK_SIZE)
+            raw.append(chunk)
+            text = det.feed(chunk, final=not chunk)
+            if text is not None:
+                parts.append(text)
+            if not chunk:
+                break
+    enc = det.result()
+    if det.utf8_ok:
+        return "".join(parts), enc
+    return b"".join(raw).decode(enc, errors="replace"), enc
@@ -0,0 +1,311 @@
+import os
+import queue
+import fnmatch
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from pathlib import Path
+from typing import Optional, Dict, Iterable, List, NamedTuple, Tuple, Union
+
+
+# ─────────────────────────────────────────────
+# 🗂️ Индекс файлов модов Workshop
+# ─────────────────────────────────────────────
+# Меняется вместе со схемой базы
+INDEX_VERSION = 3
+# Какие файлы модов индексируются (остальные ошибкам лога не нужны)
+INDEX_SUFFIXES = (".txt", ".gui", ".yml", ".csv")
+# Потоков обхода: моды обходятся параллельно, упираясь в задержки диска
+WALK_WORKERS = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS mods (mod_id TEXT PRIMARY KEY, root TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS dirs (
+    mod_id TEXT NOT NULL, rel TEXT NOT NULL, mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (mod_id, rel)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS files (
+    mod_id TEXT NOT NULL, key TEXT NOT NULL, rel TEXT NOT NULL,
+    size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (mod_id, key)
+);
+"""
+# Порядок файлов мода (rowid) — порядок обхода, как у os.walk
+
+# Каталоги мода с mtime: (относительный путь, mtime_ns); "" — корень мода
+DirStamps = List[Tuple[str, int]]
+# Файлы мода: (ключ — относительный путь в нижнем регистре через "/",
+# относительный путь как на диске, с os.sep, размер, mtime_ns)
+FileRows = List[Tuple[str, str, int, int]]
+
+
+class IndexedFile(NamedTuple):
+    """Файл мода в индексе: полный путь, размер и mtime на момент обхода"""
+    path: str
+    size: int
+    mtime_ns: int
+
+
+def rel_key(rel: str) -> str:
+    """Относительный путь → ключ индекса («Common\\Traits\\X.txt» → «common/traits/x.txt»)"""
+    return rel.replace("\\", "/").lower()
+
+
+def walk_mod(mod_dir: Union[str, os.PathLike], suffixes: Tuple[str, ...] = INDEX_SUFFIXES):
+    """
+    Обходит мод через os.scandir: (каталоги с mtime, файлы с нужными
+    суффиксами — с размером и mtime из DirEntry.stat()).
+
+    Порядок — как у os.walk (сверху вниз, файлы каталога раньше его
+    подкаталогов), символические ссылки на каталоги не раскрываются.
+    Относительные пути собираются сложением строк, без Path на каждый файл.
+    mtime каталога меняется, когда в нём создают, удаляют или переименовывают
+    записи — по ним потом проверяется, что дерево не изменилось.
+    """
+    root = os.fspath(mod_dir)
+    sep = os.sep
+    dirs: DirStamps = []
+    files: FileRows = []
+    stack = [("", root)]
+    while stack:
+        rel_dir, path = stack.pop()
+        try:
+            # os.stat, а не DirEntry.stat: на NTFS копия времени каталога в
+            # записи родителя обновляется с задержкой
+            dirs.append((rel_dir, os.stat(path).st_mtime_ns))
+            subdirs = []
+            prefix = rel_dir + sep if rel_dir else ""
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append((prefix + name, entry.path))
+                    elif name.lower().endswith(suffixes):
+                        rel = prefix + name
+                        try:
+                            st = entry.stat()
+                            size, mtime_ns = st.st_size, st.st_mtime_ns
+                        except OSError:
+                            size = mtime_ns = -1
+                        files.append((rel_key(rel), rel, size, mtime_ns))
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+    return dirs, files
+
+
+def dirs_unchanged(mod_dir: Union[str, os.PathLike], dirs: Iterable[Tuple[str, int]]) -> bool:
+    """Все ранее обойдённые каталоги на месте и с тем же mtime"""
+    root = os.fspath(mod_dir)
+    for rel, mtime_ns in dirs:
+        try:
+            if os.stat(os.path.join(root, rel) if rel else root).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+class WorkshopIndex:
+    """
+    Индекс «относительный путь → файл» по модам, сохраняемый в SQLite
+    между запусками.
+
+        index = WorkshopIndex("cache/workshop_index.sqlite")
+        files = index.build(mod_dirs)       # mod_id → {ключ: IndexedFile}
+        index.reused, index.rewalked        # сколько модов взято из кэша / обойдено
+        index.changed                       # какие моды обойдены заново
+
+    Мод обходится заново, только если изменился mtime хотя бы одного из его
+    каталогов (или каталог пропал), сменился путь мода или набор суффиксов.
+    Иначе его файлы читаются из базы: вместо обхода сотен тысяч файлов —
+    stat по каталогам. mod_id — имя папки мода.
+    """
+
+    def __init__(
+        self, db_path: Union[str, os.PathLike], suffixes: Tuple[str, ...] = INDEX_SUFFIXES
+    ):
+        self.db_path = Path(db_path)
+        self.suffixes = tuple(s.lower() for s in suffixes)
+        self.reused = 0
+        self.rewalked = 0
+        self.changed: List[str] = []
+
+    # ─────────────────────────────────────────
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Соединение на один build(): индекс строится в фоновом потоке скана,
+        а проверка конфликтов — в потоке интерфейса.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(_SCHEMA)
+        settings = f"{INDEX_VERSION}:{','.join(self.suffixes)}"
+        row = conn.execute("SELECT value FROM meta WHERE name = 'settings'").fetchone()
+        if row is None or row[0] != settings:
+            conn.executescript("DROP TABLE mods; DROP TABLE dirs; DROP TABLE files;")
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('settings', ?)", (settings,))
+        return conn
+
+    @staticmethod
+    def _load_stamps(conn: sqlite3.Connection) -> Dict[str, Tuple[str, DirStamps]]:
+        """mod_id → (корень, каталоги с mtime) — всё одним запросом"""
+        stamps: Dict[str, Tuple[str, DirStamps]] = {
+            mod_id: (root, []) for mod_id, root in conn.execute("SELECT mod_id, root FROM mods")
+        }
+        for mod_id, rel, mtime_ns in conn.execute("SELECT mod_id, rel, mtime_ns FROM dirs"):
+            if mod_id in stamps:
+                stamps[mod_id][1].append((rel, mtime_ns))
+        return stamps
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, mod_id: str, root: str, dirs: DirStamps, files: FileRows):
+        conn.execute("DELETE FROM dirs WHERE mod_id = ?", (mod_id,))
+        conn.execute("DELETE FROM files WHERE mod_id = ?", (mod_id,))
+        conn.execute("INSERT OR REPLACE INTO mods VALUES (?, ?)", (mod_id, root))
+        conn.executemany("INSERT INTO dirs VALUES (?, ?, ?)",
+                         [(mod_id, rel, mtime) for rel, mtime in dirs])
+        conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                         [(mod_id, *row) for row in files])
+
+    def build(
+        self,
+        mod_dirs: Iterable[Union[str, os.PathLike]],
+        progress: Optional[queue.Queue] = None,
+        workers: int = WALK_WORKERS,
+        reuse: Optional[Dict[str, Dict[str, IndexedFile]]] = None,
+    ) -> Dict[str, Dict[str, IndexedFile]]:
+        """
+        mod_id → {ключ относительного пути: IndexedFile} для всех mod_dirs
+        (порядок модов — как в mod_dirs).
+
+        reuse — прошлый результат build(): файлы неизменившихся модов берутся
+        из него как есть, без чтения базы.
+
+        Проверка mtime и обход изменившихся модов идут параллельно в пуле из
+        workers потоков — на HDD и сетевых папках это ожидание ввода‑вывода.
+        С базой работает только вызывающий поток: изменившиеся моды
+        перезаписываются, пропавшие из mod_dirs — удаляются.
+        В progress (если задана) после каждого мода кладётся
+        ("index", готово, всего) — интерфейс забирает её из своего потока.
+        """
+        roots = [os.fspath(d) for d in mod_dirs]
+        result: Dict[str, Dict[str, IndexedFile]] = {}
+        self.reused = self.rewalked = 0
+        self.changed = []
+        reuse = reuse or {}
+        try:
+            conn = self._connect()
+            stamps = self._load_stamps(conn)
+        except sqlite3.Error as e:
+            print(f"[WorkshopIndex] База индекса недоступна, обход без кэша: {e}")
+            conn, stamps = None, {}
+        suffixes = self.suffixes
+
+        def check(root: str):
+            """(mod_id, None) — мод не менялся; иначе (mod_id, результат обхода)"""
+            mod_id = os.path.basename(root)
+            known = stamps.get(mod_id)
+            if known and known[0] == root and known[1] and dirs_unchanged(root, known[1]):
+                return mod_id, None
+            return mod_id, walk_mod(root, suffixes)
+
+        sep = os.sep
+        with closing(conn) if conn is not None else nullcontext(), \
+                ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for i, (root, (mod_id, walked)) in enumerate(zip(roots, pool.map(check, roots)), 1):
+                prefix = root + sep
+                if walked is None:
+                    self.reused += 1
+                    if mod_id in reuse:
+                        result[mod_id] = reuse[mod_id]
+                    else:
+                        files = conn.execute(
+                            "SELECT key, rel, size, mtime_ns FROM files WHERE mod_id = ? ORDER BY rowid",
+                            (mod_id,))
+                        result[mod_id] = {key: IndexedFile(prefix + rel, size, mtime_ns)
+                                          for key, rel, size, mtime_ns in files}
+                else:
+                    dirs, files = walked
+                    self.rewalked += 1
+                    self.changed.append(mod_id)
+                    if conn is not None:
+                        with conn:
+                            self._store(conn, mod_id, root, dirs, files)
+                    result[mod_id] = {key: IndexedFile(prefix + rel, size, mtime_ns)
+                                      for key, rel, size, mtime_ns in files}
+                if progress is not None:
+                    progress.put(("index", i, len(roots)))
+            if conn is not None:
+                self._prune(conn, set(result))
+        return result
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, keep: set):
+        """Удаляет из базы моды, которых больше нет в Workshop"""
+        gone = [(m,) for (m,) in conn.execute("SELECT mod_id FROM mods") if m not in keep]
+        if gone:
+            with conn:
+                conn.executemany("DELETE FROM mods WHERE mod_id = ?", gone)
+                conn.executemany("DELETE FROM dirs WHERE mod_id = ?", gone)
+                conn.executemany("DELETE FROM files WHERE mod_id = ?", gone)
+
+
+
+# ─────────────────────────────────────────────
+# 🔎 Обратные индексы для привязки ошибок
+# ─────────────────────────────────────────────
+# Запись: (порядковый номер в file_index, mod_id, ключ, полный путь);
+# номер сохраняет порядок «первый мод, первый файл» прежних переборов
+Entry = Tuple[int, str, str, str]
+
+_WILDCARDS = frozenset("*?[")
+
+
+class FileLookup:
+    """
+    Индексы по результату WorkshopIndex.build() — строятся один раз за скан.
+
+    by_path — ключ относительного пути → файлы всех модов с этим путём;
+    by_name — имя файла → файлы с этим именем в любом каталоге. Поиск по
+    хвосту пути («traits/x.txt») и по маске имени («*_l_english.yml»)
+    идёт через by_name: маска проверяется только на именах, а не на всех
+    файлах всех модов.
+    """
+
+    def __init__(self, file_index: Dict[str, Dict[str, IndexedFile]]):
+        self.by_path: Dict[str, List[Entry]] = {}
+        self.by_name: Dict[str, List[Entry]] = {}
+        seq = 0
+        for mod_id, files in file_index.items():
+            for key, f in files.items():
+                entry = (seq, mod_id, key, f.path)
+                seq += 1
+                self.by_path.setdefault(key, []).append(entry)
+                self.by_name.setdefault(key.rpartition("/")[2], []).append(entry)
+
+    def exact(self, key: str) -> List[Entry]:
+        """Файлы с точно таким относительным путём (по порядку модов)"""
+        return self.by_path.get(key, [])
+
+    def with_suffix(self, tail: str) -> List[Entry]:
+        """Файлы, чей путь кончается на «/tail» (tail — ключ, можно с каталогами)"""
+        name = tail.rpartition("/")[2]
+        end = "/" + tail
+        return [e for e in self.by_name.get(name, ()) if e[2].endswith(end)]
+
+    def matching_name(self, pattern: str) -> List[Entry]:
+        """Файлы, чьё имя подходит под маску fnmatch (без масок — точное имя)"""
+        pattern = pattern.lower()
+        if not _WILDCARDS.intersection(pattern):
+            return list(self.by_name.get(pattern, ()))
+        names = fnmatch.filter(self.by_name, pattern)
+        return sorted(e for name in names for e in self.by_name[name])
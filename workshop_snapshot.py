@@ -0,0 +1,96 @@
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Any, Dict, List, Union
+
+from load_order import DescriptorCache
+from paradox_script import empty_descriptor
+from workshop_index import FileLookup, IndexedFile, WorkshopIndex
+
+
+# ─────────────────────────────────────────────
+# 📸 Снимок Workshop
+# ─────────────────────────────────────────────
+class WorkshopSnapshot:
+    """
+    Всё, что скан ошибок, проверка конфликтов и поиск файла ошибки знают о
+    папке Workshop, — в одном объекте, который обновляется по месту.
+
+        snapshot = WorkshopSnapshot(index, descriptors)
+        snapshot.refresh(ws_path, progress)     # True — что‑то изменилось
+        snapshot.mods[mod_id]                   # name, path, replace_path, dependencies…
+        snapshot.files[mod_id][key]             # IndexedFile(path, size, mtime_ns)
+        snapshot.lookup                         # FileLookup по всем модам
+        snapshot.duplicates[key]                # моды с этим файлом (если их ≥2)
+
+    refresh() проверяет mtime каталогов модов (WorkshopIndex) и дескрипторы
+    (DescriptorCache); файлы неизменившихся модов остаются в памяти, а
+    lookup и duplicates пересобираются, только если изменился набор файлов.
+    Атрибуты заменяются целиком, поэтому читать их можно из другого потока,
+    пока идёт refresh(). Размер и mtime файла — на момент обхода мода:
+    правка файла без изменения каталога их не обновляет.
+    """
+
+    def __init__(self, index: WorkshopIndex, descriptors: DescriptorCache):
+        self.index = index
+        self.descriptors = descriptors
+        self.ws_path: Optional[Path] = None
+        self.mods: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, IndexedFile]] = {}
+        self.lookup = FileLookup({})
+        self.duplicates: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    # ─────────────────────────────────────────
+    def mod_info(self, mod_dir: Path) -> Dict[str, Any]:
+        """
+        Метаданные мода: поля дескриптора плюс id (имя папки) и path.
+        Имя ищется в descriptor.mod, <id>.mod, затем в любом *.mod папки.
+        """
+        mod_id = mod_dir.name
+        candidates = [mod_dir / "descriptor.mod", mod_dir / f"{mod_id}.mod"]
+        desc = self.descriptors.read(candidates[0])
+        name = desc["name"] or self.descriptors.read(candidates[1])["name"]
+        if not name:
+            for other in mod_dir.glob("*.mod"):
+                if other not in candidates:
+                    name = self.descriptors.read(other)["name"]
+                    if name:
+                        break
+        return {**desc, "id": mod_id, "name": name or f"Mod_{mod_id}", "path": str(mod_dir)}
+
+    def refresh(
+        self, ws_path: Union[str, os.PathLike], progress: Optional[queue.Queue] = None
+    ) -> bool:
+        """
+        Приводит снимок к текущему состоянию Workshop; True — изменился
+        набор модов или файлов. Вызовы из разных потоков выполняются
+        по очереди.
+        """
+        ws_path = Path(ws_path)
+        with self._lock:
+            mod_dirs = sorted((d for d in ws_path.iterdir() if d.is_dir()), key=lambda d: d.name)
+            same_root = ws_path == self.ws_path
+            files = self.index.build(mod_dirs, progress, reuse=self.files if same_root else None)
+            mods = {}
+            for mod_dir in mod_dirs:
+                try:
+                    mods[mod_dir.name] = self.mod_info(mod_dir)
+                except OSError as e:
+                    print(f"[WorkshopSnapshot] {mod_dir}: {e}")
+                    mods[mod_dir.name] = {**empty_descriptor(), "id": mod_dir.name,
+                                          "name": f"Mod_{mod_dir.name}", "path": str(mod_dir)}
+            self.mods = mods
+            changed = not same_root or bool(self.index.changed) or list(files) != list(self.files)
+            if changed:
+                lookup = FileLookup(files)
+                self.duplicates = {
+                    key: [mod_id for _, mod_id, _, _ in entries]
+                    for key, entries in lookup.by_path.items() if len(entries) > 1
+                }
+                self.lookup = lookup
+            self.files = files
+            self.ws_path = ws_path
+            self.descriptors.save()
+            return changed